@@ -0,0 +1,271 @@
+"""Benchmarks the ACO algorithms on fixed and generated TSP instances"""
+import argparse
+import array
+import cProfile
+import json
+import platform
+import random
+import sys
+import time
+import elitist_aco_algorithm
+import elitist_mmas_aco_algorithm
+import mmas_aco_algorithm
+import tsp_aco_algorithm
+from instance_loader import CoordinateInstance, load_instance
+from instrumentation import Instrumentation
+
+# The algorithm modules being benchmarked, with the arguments passed after
+# the dataset (the same values as each module's main execution method)
+ALGORITHMS = {
+    "aco": (tsp_aco_algorithm.ant_colony_optimisation_algorithm,
+            (130, 500, 0.5, 9, 0, 0.3)),
+    "elitist": (elitist_aco_algorithm.ant_colony_optimisation_algorithm,
+                (130, 500, 0.5, 9, 0, 0.2, 0.3)),
+    "mmas": (mmas_aco_algorithm.ant_colony_optimisation_algorithm,
+             (130, 500, 0.5, 9, 0, 0.3, 10, 1)),
+    "elitist_mmas": (
+        elitist_mmas_aco_algorithm.ant_colony_optimisation_algorithm,
+        (130, 500, 0.5, 9, 0, 0.2, 0.3, 10, 1)),
+}
+
+# The datasets in the docs folder that are always benchmarked, run for the
+# full 10,000 fitness evaluations
+DATASETS = ("burma14.xml", "brazil58.xml")
+# The sizes of the generated instances that can be benchmarked, with the
+# number of fitness evaluations each is run for, so that each run takes a
+# similar amount of time
+GENERATED_EVALUATIONS = {100: 2_000, 200: 1_000, 500: 400, 1_000: 200,
+                         2_000: 100, 5_000: 40}
+# The generated sizes benchmarked unless told otherwise, the larger sizes
+# need several GB of memory with the Python engine
+DEFAULT_SIZES = (100, 200, 500)
+# Runs which are this much slower than the baseline are reported as
+# regressions
+REGRESSION_TOLERANCE = 0.1
+
+
+def generate_instance(num_nodes: int, seed: int = 0) -> CoordinateInstance:
+    """
+    Generates a random Euclidean instance, with every node at a different
+    point of a square grid so no edge has a length of 0.
+
+    Args:
+        num_nodes (int): The number of nodes in the instance.
+        seed (int): The seed used to place the nodes, so the same instance is
+            generated every time.
+
+    Returns:
+        instance (CoordinateInstance): The generated instance.
+    """
+    generator = random.Random(seed)
+    side = 10 * num_nodes
+    points = generator.sample(range(0, side * side), num_nodes)
+
+    return CoordinateInstance("random" + str(num_nodes), "EUC_2D",
+                              array.array('d', [p // side for p in points]),
+                              array.array('d', [p % side for p in points]))
+
+
+def run_benchmark(instance_name: str, load, algorithm: str, engine: str,
+                  evaluations: int, seed: int) -> dict:
+    """
+    Runs one algorithm on one instance and measures it.
+
+    Args:
+        instance_name (str): The name the instance is reported under.
+        load (function): Loads the instance, so the time taken to load it
+            can be measured.
+        algorithm (str): The key of the algorithm in ALGORITHMS.
+        engine (str): The engine used to build the ants' paths.
+        evaluations (int): The number of fitness evaluations performed.
+        seed (int): The seed of the run.
+
+    Returns:
+        result (dict): The wall time, evaluations per second, time taken by
+            each phase, hot path counters and best fitness found by the run.
+    """
+    (function, arguments) = ALGORITHMS[algorithm]
+
+    start_time = time.perf_counter()
+    instance = load()
+    load_time = time.perf_counter() - start_time
+
+    random.seed(seed)
+    instrumentation = Instrumentation()
+    start_time = time.perf_counter()
+    (best_fitness, best_path, average_solution_tracker) = function(
+        instance, *arguments, engine=engine, evaluations=evaluations,
+        instrumentation=instrumentation)
+    solve_time = time.perf_counter() - start_time
+
+    # The phases within the solve are measured by the algorithm itself
+    phases = {"load": load_time, "solve": solve_time}
+    phases.update(instrumentation.timings)
+
+    return {
+        "instance": instance_name,
+        "num_nodes": instance.num_nodes,
+        "algorithm": algorithm,
+        "engine": engine,
+        "seed": seed,
+        "evaluations": evaluations,
+        "wall_time": load_time + solve_time,
+        "evaluations_per_second": evaluations / solve_time,
+        "phases": phases,
+        "counters": instrumentation.counters,
+        "best_fitness": best_fitness,
+    }
+
+
+def run_suite(algorithms: [str] = None, engines: [str] = ("python",),
+              sizes: [int] = DEFAULT_SIZES, seed: int = 0,
+              docs_directory: str = "../docs") -> dict:
+    """
+    Runs every algorithm with every engine on the datasets and generated
+    instances, one run each with a pinned seed.
+
+    Args:
+        algorithms ([str]): The keys of the algorithms in ALGORITHMS to run,
+            None runs every algorithm.
+        engines ([str]): The engines to run each algorithm with.
+        sizes ([int]): The sizes of the generated instances to run, each a
+            key of GENERATED_EVALUATIONS.
+        seed (int): The seed of every run.
+        docs_directory (str): The folder storing the datasets.
+
+    Returns:
+        report (dict): The environment the suite was run in and the result of
+            each run, ready to be written as JSON.
+    """
+    if algorithms is None:
+        algorithms = list(ALGORITHMS)
+
+    cases = []
+    for dataset in DATASETS:
+        cases.append((dataset.split(".")[0],
+                      lambda dataset=dataset: load_instance(
+                          docs_directory + "/" + dataset),
+                      10_000))
+    for size in sizes:
+        cases.append(("random" + str(size),
+                      lambda size=size: generate_instance(size, seed),
+                      GENERATED_EVALUATIONS[size]))
+
+    results = []
+    for (instance_name, load, evaluations) in cases:
+        for algorithm in algorithms:
+            for engine in engines:
+                result = run_benchmark(instance_name, load, algorithm,
+                                       engine, evaluations, seed)
+                print(instance_name, algorithm, engine,
+                      round(result["wall_time"], 2), "s",
+                      round(result["evaluations_per_second"]),
+                      "evaluations/s", file=sys.stderr)
+                results.append(result)
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict) -> [dict]:
+    """
+    Compares the runs in a report with the same runs (instance, algorithm,
+    engine and seed) in a baseline report.
+
+    Args:
+        report (dict): The report being checked, as returned by run_suite.
+        baseline (dict): An earlier report.
+
+    Returns:
+        comparisons ([dict]): For each run found in both reports, its
+            speedup over the baseline (above 1 is faster), the change in its
+            best fitness and whether it is a regression.
+    """
+    def key(result: dict) -> tuple:
+        return (result["instance"], result["algorithm"], result["engine"],
+                result["seed"], result["evaluations"])
+
+    baseline_results = {key(result): result
+                        for result in baseline["results"]}
+
+    comparisons = []
+    for result in report["results"]:
+        previous = baseline_results.get(key(result))
+        if previous is None:
+            continue
+        speedup = (result["evaluations_per_second"]
+                   / previous["evaluations_per_second"])
+        comparisons.append({
+            "instance": result["instance"],
+            "algorithm": result["algorithm"],
+            "engine": result["engine"],
+            "speedup": speedup,
+            "fitness_change": result["best_fitness"]
+            - previous["best_fitness"],
+            "regression": speedup < 1 - REGRESSION_TOLERANCE,
+        })
+
+    return comparisons
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the ACO algorithms and writes the results "
+        + "as JSON.")
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS))
+    parser.add_argument("--engines", nargs="+", default=["python"],
+                        choices=["python", "numpy", "parallel"])
+    parser.add_argument("--sizes", nargs="*", type=int,
+                        default=list(DEFAULT_SIZES),
+                        choices=list(GENERATED_EVALUATIONS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="The file the report is written "
+                        + "to, the report is printed if not given.")
+    parser.add_argument("--baseline",
+                        default="../docs/benchmark_baseline.json",
+                        help="The report the results are compared with.")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Overwrites the baseline with these results.")
+    parser.add_argument("--profile", help="The file cProfile statistics of "
+                        + "the whole suite are written to, which can be "
+                        + "viewed as a flame graph with tools such as "
+                        + "snakeviz or flameprof.")
+    args = parser.parse_args()
+
+    profiler = None
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    report = run_suite(args.algorithms, args.engines, args.sizes, args.seed)
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        try:
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+        except FileNotFoundError:
+            baseline = None
+        if baseline is not None:
+            report["comparison"] = compare_to_baseline(report, baseline)
+            for comparison in report["comparison"]:
+                print(comparison["instance"], comparison["algorithm"],
+                      comparison["engine"],
+                      "speedup:", round(comparison["speedup"], 2),
+                      "REGRESSION" if comparison["regression"] else "",
+                      file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
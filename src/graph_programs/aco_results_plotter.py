@@ -1,4 +1,5 @@
 from tsp_aco_algorithm import *
+from parameter_sweep import DEFAULT_STORE, average_best_fitness, run_sweep
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -6,32 +7,19 @@ import numpy as np
 
 # FOR EACH GRAPH, INCLUDE THE PARAMETERS USED AND BEST SOLUTION LENGTH FOUND
 
-def evaporation_rate_graph(file_name):
+def evaporation_rate_graph(file_name, workers=None, store=DEFAULT_STORE):
     # Graph for e values (x axis is the e value being tested y axis is the average of best solutions from 10 runs).
     # Find the average best solutions length over 10 runs for e values between 0 and 1
-    e = 0
-    average_of_best_runs = [0] * 11
-    best_runs = []
-    best_run = 0
-    best_path = []
-    with open('../docs/' + file_name, 'r') as file:
-        file_data = file.read()
-
-    xml_data1 = BeautifulSoup(file_data, 'xml')
-
-    # Loop through each e value and calculate the average of the 10 best runs
-    for index in range(0,11):
-        # Loop 10 times for each given evaporation rate
-        # Add the best solution to an array of values
-        for run in range(0,10):
-            (best_run, best_path) = ant_colony_optimisation_algorithm(xml_data1, 10, 1, 1, 2, 0, e)
-            best_runs.append(best_run)
-            average_of_best_runs[index] += best_run
-
-        average_of_best_runs[index] /= 10
-        e += 0.1
-
-    xaxis = np.array([0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1])
+    evaporation_rates = [0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1]
+
+    # Run the algorithm 10 times for each e value, sharing the runs between the worker processes, and calculate the
+    # average of the best solutions found
+    results = run_sweep(ant_colony_optimisation_algorithm, '../docs/' + file_name,
+                        [(10, 1, 1, 2, 0, e) for e in evaporation_rates], 10, workers,
+                        store=store)
+    average_of_best_runs = average_best_fitness(results)
+
+    xaxis = np.array(evaporation_rates)
     # Ensures that every evaporation size being tested is show in the graph
     plt.xticks(xaxis)
     yaxis = np.array(average_of_best_runs)
@@ -45,31 +33,17 @@ def evaporation_rate_graph(file_name):
     plt.show()
 
 # Graph for colony size
-def colony_size_graph(file_name):
+def colony_size_graph(file_name, workers=None, store=DEFAULT_STORE):
     # x axis is the size of the colony, y axis is the average best solution over 10 runs
-    colony_size = 10
-    average_of_best_runs = [0] * 13
-    best_runs = []
-    best_run = 0
-    best_path = []
-    with open('../docs/' + file_name, 'r') as file:
-        file_data = file.read()
-
-    xml_data1 = BeautifulSoup(file_data, 'xml')
-
-    # Loop through each colony size and calculate the average of the 10 best runs
-    for index in range(0,13):
-        # Loop 10 times for each given colony size
-        # Add the best solution to an array of values
-        for run in range(0,5):
-            (best_run, best_path) = ant_colony_optimisation_algorithm(xml_data1, colony_size, 1, 1, 2, 0, 0.5)
-            best_runs.append(best_run)
-            average_of_best_runs[index] += best_run
-
-        average_of_best_runs[index] /= 5
-        colony_size += 10
-
-    xaxis = np.array([10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 110, 120, 130])
+    colony_sizes = [10, 20, 30, 40, 50, 60, 70, 80, 90, 100, 110, 120, 130]
+
+    # Run the algorithm 5 times for each colony size and calculate the average of the best solutions found
+    results = run_sweep(ant_colony_optimisation_algorithm, '../docs/' + file_name,
+                        [(colony_size, 1, 1, 2, 0, 0.5) for colony_size in colony_sizes], 5, workers,
+                        store=store)
+    average_of_best_runs = average_best_fitness(results)
+
+    xaxis = np.array(colony_sizes)
     # Ensures that every colony size being evaluated is shown on the x-axis
     plt.xticks(xaxis)
     yaxis = np.array(average_of_best_runs)
@@ -83,31 +57,17 @@ def colony_size_graph(file_name):
     plt.show()
 
 # Graph local heuristic functions (heuristic matrix and q value)
-def q_value_graph(file_name):
+def q_value_graph(file_name, workers=None, store=DEFAULT_STORE):
     # x axis is the value of q, y axis is the average best solution over 10 runs
-    q = 0.1
-    average_of_best_runs = [0] * 9
-    best_runs = []
-    best_run = 0
-    best_path = []
-    with open('../docs/' + file_name, 'r') as file:
-        file_data = file.read()
-
-    xml_data1 = BeautifulSoup(file_data, 'xml')
-
-    # Loop through each q value and calculate the average of the 10 best runs
-    for index in range(0,9):
-        # Loop 10 times for each given q value
-        # Add the best solution to an array of values
-        for run in range(0,5):
-            (best_run, best_path) = ant_colony_optimisation_algorithm(xml_data1, 10, q, 1, 2, 0, 0.5)
-            best_runs.append(best_run)
-            average_of_best_runs[index] += best_run
-
-        average_of_best_runs[index] /= 5
-        q *= 10
-
-    xaxis = np.array([0.1, 1, 10, 100, 1000, 10000, 100000, 1000000, 10000000])
+    q_values = [0.1, 1, 10, 100, 1000, 10000, 100000, 1000000, 10000000]
+
+    # Run the algorithm 5 times for each q value and calculate the average of the best solutions found
+    results = run_sweep(ant_colony_optimisation_algorithm, '../docs/' + file_name,
+                        [(10, q, 1, 2, 0, 0.5) for q in q_values], 5, workers,
+                        store=store)
+    average_of_best_runs = average_best_fitness(results)
+
+    xaxis = np.array(q_values)
     # Ensures that every q value being evaluated is shown on the x-axis
     plt.xticks(xaxis)
     yaxis = np.array(average_of_best_runs)
@@ -121,31 +81,17 @@ def q_value_graph(file_name):
     plt.show()
 
 # Graph for Beta values (heuristic importance factor)
-def beta_value_graph(file_name):
+def beta_value_graph(file_name, workers=None, store=DEFAULT_STORE):
     # x axis is the value of beta, y axis is the average best solution over 10 runs
-    beta = 1
-    average_of_best_runs = [0] * 11
-    best_runs = []
-    best_run = 0
-    best_path = []
-    with open('../docs/' + file_name, 'r') as file:
-        file_data = file.read()
-
-    xml_data1 = BeautifulSoup(file_data, 'xml')
-
-    # Loop through each beta value and calculate the average of the 10 best runs
-    for index in range(0, 11):
-        # Loop 10 times for each given beta value
-        # Add the best solution to an array of values
-        for run in range(0, 5):
-            (best_run, best_path) = ant_colony_optimisation_algorithm(xml_data1, 10, 1, 1, beta, 0, 0.5)
-            best_runs.append(best_run)
-            average_of_best_runs[index] += best_run
-
-        average_of_best_runs[index] /= 5
-        beta += 1
-
-    xaxis = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11])
+    beta_values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]
+
+    # Run the algorithm 5 times for each beta value and calculate the average of the best solutions found
+    results = run_sweep(ant_colony_optimisation_algorithm, '../docs/' + file_name,
+                        [(10, 1, 1, beta, 0, 0.5) for beta in beta_values], 5, workers,
+                        store=store)
+    average_of_best_runs = average_best_fitness(results)
+
+    xaxis = np.array(beta_values)
     # Ensures that every beta value being evaluated is shown on the x-axis
     plt.xticks(xaxis)
     yaxis = np.array(average_of_best_runs)
@@ -159,31 +105,17 @@ def beta_value_graph(file_name):
     plt.show()
 
 # Graph for Alpha values (pheromone importance factor)
-def alpha_value_graph(file_name):
+def alpha_value_graph(file_name, workers=None, store=DEFAULT_STORE):
     # x axis is the value of alpha, y axis is the average best solution over 10 runs
-    alpha = 0
-    average_of_best_runs = [0] * 11
-    best_runs = []
-    best_run = 0
-    best_path = []
-    with open('../docs/' + file_name, 'r') as file:
-        file_data = file.read()
-
-    xml_data1 = BeautifulSoup(file_data, 'xml')
-
-    # Loop through each alpha value and calculate the average of the 10 best runs
-    for index in range(0,11):
-        # Loop 10 times for each given alpha value
-        # Add the best solution to an array of values
-        for run in range(0,5):
-            (best_run, best_path) = ant_colony_optimisation_algorithm(xml_data1, 10, 1, alpha, 2, 0, 0.5)
-            best_runs.append(best_run)
-            average_of_best_runs[index] += best_run
-
-        average_of_best_runs[index] /= 5
-        alpha += 1
-
-    xaxis = np.array([0, 0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5])
+    alpha_values = [0, 0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5]
+
+    # Run the algorithm 5 times for each alpha value and calculate the average of the best solutions found
+    results = run_sweep(ant_colony_optimisation_algorithm, '../docs/' + file_name,
+                        [(10, 1, alpha, 2, 0, 0.5) for alpha in alpha_values], 5, workers,
+                        store=store)
+    average_of_best_runs = average_best_fitness(results)
+
+    xaxis = np.array(alpha_values)
     # Ensures that every alpha value being evaluated is shown on the x-axis
     plt.xticks(xaxis)
     yaxis = np.array(average_of_best_runs)
@@ -213,10 +145,7 @@ def optimal_parameters_graph(file_name):
     colony_size = 130
     q = 500
 
-    with open('../docs/' + file_name, 'r') as file:
-        file_data = file.read()
-
-    xml_data1 = BeautifulSoup(file_data, 'xml')
+    xml_data1 = load_instance('../docs/' + file_name, cache=True)
 
     # Call the function with the given parameters
     (best_fitness, best_path, average_solution_tracker) = ant_colony_optimisation_algorithm(xml_data1, colony_size, q, alpha, beta, 0, evaporation_rate)
@@ -16,10 +16,7 @@ def elitist_mmas_graph(file_name):
     upper_bound = 1
     lower_bound = 30
 
-    with open('../docs/' + file_name, 'r') as file:
-        file_data = file.read()
-
-    xml_data1 = BeautifulSoup(file_data, 'xml')
+    xml_data1 = load_instance('../docs/' + file_name, cache=True)
 
     # Call the function with the given parameters
     (best_fitness, best_path, average_solution_tracker) = ant_colony_optimisation_algorithm(xml_data1, colony_size, q, alpha, beta, 0, evaporation_rate)
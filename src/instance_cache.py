@@ -0,0 +1,189 @@
+"""Caches compiled TSP instances as memory-mapped binary files"""
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from instance_loader import TSPInstance, parse_xml
+
+# Changing the layout of a cache file requires a new magic value, so files
+# written in an older layout are treated as stale
+MAGIC = b"TSPACO01"
+# magic, byte order, precision, number of nodes, length of the name
+HEADER = struct.Struct("<8s1siQI")
+EXTENSION = ".tspc"
+# The cache is capped at 1 GiB unless told otherwise
+MAX_CACHE_BYTES = 1 << 30
+
+
+def default_cache_directory() -> str:
+    """
+    Returns:
+        directory (str): The directory compiled instances are stored in, set
+            by the TSP_ACO_CACHE_DIR environment variable and otherwise a
+            folder in the user's cache directory.
+    """
+    directory = os.environ.get("TSP_ACO_CACHE_DIR")
+    if directory:
+        return directory
+
+    return os.path.join(os.path.expanduser("~"), ".cache", "tsp_aco")
+
+
+def file_hash(file_path: str) -> str:
+    """
+    Args:
+        file_path (str): The path to the dataset being hashed.
+
+    Returns:
+        digest (str): The SHA-256 hash of the dataset's contents, which is
+            used as the key of its compiled instance.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def write_compiled_instance(instance: TSPInstance, cache_path: str) -> None:
+    """
+    Writes an instance to a compiled binary file. The distance matrix is
+    stored after the header, aligned to 8 bytes, so that it can be memory
+    mapped and read as an array of doubles without being copied. The file is
+    written to a temporary file first and then moved into place, so other
+    processes never see a partially written file.
+
+    Args:
+        instance (TSPInstance): The instance being compiled.
+        cache_path (str): The path the compiled instance is written to.
+    """
+    name = instance.name.encode("utf-8")
+    header = HEADER.pack(MAGIC, sys.byteorder[0].encode("ascii"),
+                         instance.precision, instance.num_nodes, len(name))
+    header += name
+    header += b"\0" * (-len(header) % 8)
+
+    directory = os.path.dirname(cache_path)
+    (handle, temporary_path) = tempfile.mkstemp(dir=directory,
+                                                suffix=".tmp")
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            file.write(header)
+            file.write(memoryview(instance.distances).cast('B'))
+        os.replace(temporary_path, cache_path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def read_compiled_instance(cache_path: str) -> TSPInstance:
+    """
+    Memory maps a compiled instance read-only. The distance matrix is not
+    copied, so loading is near instant and every process reading the same
+    instance shares the same pages of memory.
+
+    Args:
+        cache_path (str): The path to the compiled instance.
+
+    Returns:
+        instance (TSPInstance): The compiled instance, or None if the file is
+            stale (written in another layout or byte order) or incomplete.
+    """
+    with open(cache_path, 'rb') as file:
+        size = os.fstat(file.fileno()).st_size
+        if size < HEADER.size:
+            return None
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    (magic, byte_order, precision,
+     num_nodes, name_length) = HEADER.unpack_from(buffer)
+    offset = HEADER.size + name_length
+    offset += -offset % 8
+    if (magic != MAGIC
+            or byte_order != sys.byteorder[0].encode("ascii")
+            or size != offset + 8 * num_nodes * num_nodes):
+        buffer.close()
+        return None
+
+    name = bytes(buffer[HEADER.size:HEADER.size + name_length])
+    # The memoryview keeps the memory map open for as long as it is in use
+    distances = memoryview(buffer)[offset:].cast('d')
+
+    return TSPInstance(name.decode("utf-8"), num_nodes, precision, distances)
+
+
+def prune_cache(cache_directory: str, max_bytes: int) -> None:
+    """
+    Removes compiled instances, least recently used first, until the total
+    size of the cache is no larger than max_bytes.
+
+    Args:
+        cache_directory (str): The directory storing the compiled instances.
+        max_bytes (int): The largest total size the cache can have.
+    """
+    entries = []
+    total = 0
+    for entry in os.scandir(cache_directory):
+        if entry.name.endswith(EXTENSION) and entry.is_file():
+            status = entry.stat()
+            entries.append((status.st_mtime, status.st_size, entry.path))
+            total += status.st_size
+
+    # The modification time is updated whenever an entry is used, so the
+    # oldest entries are the least recently used
+    entries.sort()
+    for (last_used, size, path) in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+def load_cached_instance(file_path: str,
+                         cache_directory: str = None,
+                         max_bytes: int = MAX_CACHE_BYTES) -> TSPInstance:
+    """
+    Loads a dataset through the compiled instance cache. The first time a
+    dataset is loaded it is parsed and its compiled form is written to the
+    cache, keyed by the hash of its contents. Later loads memory map the
+    compiled file instead of parsing the dataset again.
+
+    Args:
+        file_path (str): The path to the dataset.
+        cache_directory (str): The directory storing the compiled instances,
+            None uses default_cache_directory.
+        max_bytes (int): The largest total size the cache can grow to before
+            the least recently used entries are removed.
+
+    Returns:
+        instance (TSPInstance): The instance stored in the dataset.
+    """
+    if cache_directory is None:
+        cache_directory = default_cache_directory()
+    os.makedirs(cache_directory, exist_ok=True)
+
+    cache_path = os.path.join(cache_directory,
+                              file_hash(file_path) + EXTENSION)
+    if os.path.exists(cache_path):
+        instance = read_compiled_instance(cache_path)
+        if instance is not None:
+            # Marks the entry as recently used
+            os.utime(cache_path)
+            return instance
+        # Stale entries are rebuilt from the dataset
+        try:
+            os.unlink(cache_path)
+        except FileNotFoundError:
+            pass
+
+    instance = parse_xml(file_path)
+    write_compiled_instance(instance, cache_path)
+    prune_cache(cache_directory, max_bytes)
+
+    return instance
@@ -0,0 +1,342 @@
+"""Loads the TSP instances used by the ACO algorithms"""
+import array
+import math
+import xml.etree.ElementTree as ElementTree
+
+# The edge weight types of TSPLIB coordinate datasets that can be loaded
+COORDINATE_TYPES = ("EUC_2D", "CEIL_2D", "ATT", "GEO")
+
+
+class TSPInstance:
+    """
+    A travelling salesperson problem instance. The distance matrix is stored
+    row by row in a single contiguous array of doubles, so the distance from
+    node i to node j is found at index i * num_nodes + j.
+
+    Attributes:
+        name (str): The name of the instance, as given in the dataset.
+        num_nodes (int): The number of nodes in the graph.
+        precision (int): The number of decimal places every value in the
+            instance is stored to.
+        distances (array): The distance matrix, stored as a flat array of
+            num_nodes * num_nodes doubles.
+    """
+
+    def __init__(self, name: str, num_nodes: int, precision: int,
+                 distances: array.array):
+        self.name = name
+        self.num_nodes = num_nodes
+        self.precision = precision
+        self.distances = distances
+
+    def distance(self, i: int, j: int) -> float:
+        """
+        Args:
+            i (int): The index of the node the edge leaves from.
+            j (int): The index of the node the edge leads to.
+
+        Returns:
+            distance (float): The cost of the edge from node i to node j.
+        """
+        return self.distances[i * self.num_nodes + j]
+
+    def graph(self) -> [[float]]:
+        """
+        Returns:
+            graph ([[float]]): The distance matrix as a 2D array, where each
+                index stores the distance from one node to another node. This
+                is the form used by the Python implementation of the ACO.
+        """
+        n = self.num_nodes
+        return [self.distances[i * n:(i + 1) * n].tolist()
+                for i in range(0, n)]
+
+
+class CoordinateInstance(TSPInstance):
+    """
+    A travelling salesperson problem instance defined by the coordinates of
+    its nodes, as in TSPLIB coordinate datasets. Only the coordinates are
+    stored, each distance being calculated from them using the rounding rules
+    of the instance's edge weight type, so loading the instance takes O(n)
+    time and memory. The solvers still build the full distance matrix (see
+    graph) when they are initialised, as every ant reads a row of it at each
+    step, so a run takes O(n^2) memory like any other instance.
+
+    Attributes:
+        name (str): The name of the instance, as given in the dataset.
+        num_nodes (int): The number of nodes in the graph.
+        precision (int): The number of decimal places values are stored to.
+            TSPLIB distances are whole numbers, so double precision is used.
+        edge_weight_type (str): The TSPLIB edge weight type, one of EUC_2D,
+            CEIL_2D, ATT or GEO.
+        x (array): The first coordinate of each node (the latitude for GEO).
+        y (array): The second coordinate of each node (the longitude for GEO).
+    """
+
+    def __init__(self, name: str, edge_weight_type: str, x: array.array,
+                 y: array.array):
+        self.name = name
+        self.num_nodes = len(x)
+        self.precision = 15
+        self.edge_weight_type = edge_weight_type
+        self.x = x
+        self.y = y
+        self._distances = None
+
+        # GEO distances are calculated from the latitude and longitude in
+        # radians, so these are converted once when the instance is loaded
+        if edge_weight_type == "GEO":
+            self.x = array.array('d', [geographical_radians(value)
+                                       for value in x])
+            self.y = array.array('d', [geographical_radians(value)
+                                       for value in y])
+
+    def distance(self, i: int, j: int) -> float:
+        """
+        Args:
+            i (int): The index of the node the edge leaves from.
+            j (int): The index of the node the edge leads to.
+
+        Returns:
+            distance (float): The cost of the edge from node i to node j,
+                calculated from the coordinates of the two nodes.
+        """
+        if i == j:
+            return 0.0
+
+        if self.edge_weight_type == "GEO":
+            q1 = math.cos(self.y[i] - self.y[j])
+            q2 = math.cos(self.x[i] - self.x[j])
+            q3 = math.cos(self.x[i] + self.x[j])
+            return float(int(6378.388 * math.acos(
+                0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)) + 1.0))
+
+        dx = self.x[i] - self.x[j]
+        dy = self.y[i] - self.y[j]
+        if self.edge_weight_type == "ATT":
+            r = math.sqrt((dx * dx + dy * dy) / 10.0)
+            t = int(r + 0.5)
+            return float(t + 1 if t < r else t)
+        elif self.edge_weight_type == "CEIL_2D":
+            return float(math.ceil(math.sqrt(dx * dx + dy * dy)))
+
+        return float(int(math.sqrt(dx * dx + dy * dy) + 0.5))
+
+    def graph(self) -> [[float]]:
+        """
+        Returns:
+            graph ([[float]]): The distance matrix as a 2D array, calculated
+                from the coordinates of the nodes. This takes O(n^2) time and
+                memory, and is called by the solvers whenever they are
+                initialised.
+        """
+        distance = self.distance
+        return [[distance(i, j) for j in range(0, self.num_nodes)]
+                for i in range(0, self.num_nodes)]
+
+    @property
+    def distances(self) -> array.array:
+        """
+        Returns:
+            distances (array): The full distance matrix as a flat array. This
+                takes O(n^2) memory, so it is calculated the first time it is
+                requested and then kept.
+        """
+        if self._distances is None:
+            self._distances = array.array('d')
+            for row in self.graph():
+                self._distances.extend(row)
+
+        return self._distances
+
+
+def geographical_radians(value: float) -> float:
+    """
+    Converts a TSPLIB GEO coordinate, stored as DDD.MM (degrees and minutes),
+    into radians.
+
+    Args:
+        value (float): The coordinate in degrees and minutes.
+
+    Returns:
+        radians (float): The coordinate in radians, using the value of pi
+            given by the TSPLIB specification.
+    """
+    degrees = int(value)
+    minutes = value - degrees
+    return 3.141592 * (degrees + 5.0 * minutes / 3.0) / 180.0
+
+
+def parse_tsplib(file_path: str) -> CoordinateInstance:
+    """
+    Reads a TSPLIB dataset (.tsp) whose nodes are given in a
+    NODE_COORD_SECTION. Only the coordinates are read, the distances being
+    calculated from them when needed.
+
+    Args:
+        file_path (str): The path to the TSPLIB dataset.
+
+    Returns:
+        instance (CoordinateInstance): The instance stored in the file.
+    """
+    specification = {}
+    x = array.array('d')
+    y = array.array('d')
+
+    with open(file_path, 'r') as file:
+        # Reads the specification part of the file, which is made up of
+        # KEY : VALUE lines
+        for line in file:
+            line = line.strip()
+            if line.startswith("NODE_COORD_SECTION"):
+                break
+            if ":" in line:
+                (key, value) = line.split(":", 1)
+                specification[key.strip()] = value.strip()
+
+        edge_weight_type = specification.get("EDGE_WEIGHT_TYPE", "")
+        if edge_weight_type not in COORDINATE_TYPES:
+            raise ValueError("Unsupported EDGE_WEIGHT_TYPE: "
+                             + edge_weight_type)
+
+        # Each line of the coordinate section stores a node's number
+        # followed by its coordinates
+        for line in file:
+            fields = line.split()
+            if len(fields) < 3 or fields[0] == "EOF":
+                break
+            x.append(float(fields[1]))
+            y.append(float(fields[2]))
+
+    return CoordinateInstance(specification.get("NAME", ""),
+                              edge_weight_type, x, y)
+
+
+def parse_xml(file_path: str) -> TSPInstance:
+    """
+    Reads a TSP instance stored in the XML format used by the datasets in the
+    docs folder. The file is read in a single streaming pass, each edge cost
+    being written straight into the distance array and then discarded, so no
+    tree of the whole document is ever held in memory.
+
+    Args:
+        file_path (str): The path to the XML dataset.
+
+    Returns:
+        instance (TSPInstance): The instance stored in the file.
+    """
+    name = ""
+    # Double precision is used when the dataset does not specify a precision
+    precision = 15
+    num_nodes = 0
+    distances = None
+    # The edges of the vertex currently being read, as (node, cost) pairs
+    row = []
+    vertex = 0
+    graph_element = None
+
+    for (event, element) in ElementTree.iterparse(file_path,
+                                                  events=('start', 'end')):
+        if event == 'start':
+            if element.tag == 'graph':
+                graph_element = element
+            continue
+
+        if element.tag == 'edge':
+            row.append((int(element.text), float(element.get('cost'))))
+            element.clear()
+        elif element.tag == 'vertex':
+            # The first vertex has an edge to every other node, so the size
+            # of the distance array is known once it has been read
+            if distances is None:
+                num_nodes = len(row) + 1
+                distances = array.array('d', [0.0]) * (num_nodes * num_nodes)
+
+            offset = vertex * num_nodes
+            for (node, cost) in row:
+                distances[offset + node] = round(cost, precision)
+
+            row = []
+            vertex += 1
+            # Removes the finished vertex from the partially built document
+            graph_element.clear()
+        elif element.tag == 'name':
+            name = (element.text or "").strip()
+        elif element.tag == 'doublePrecision':
+            precision = int(element.text)
+
+    if distances is None:
+        distances = array.array('d')
+
+    return TSPInstance(name, num_nodes, precision, distances)
+
+
+def from_beautiful_soup(xml_data: []) -> TSPInstance:
+    """
+    Builds an instance from XML data that has already been parsed by
+    BeautifulSoup, so existing callers can keep passing their parsed data.
+
+    Args:
+        xml_data ([]): The raw data extracted from the provided XML datasets
+            by BeautifulSoup.
+
+    Returns:
+        instance (TSPInstance): The instance stored in the XML data.
+    """
+    precision = 15
+    accuracy = xml_data.find('doublePrecision')
+    if accuracy is not None:
+        precision = int(accuracy.string)
+
+    name = ""
+    name_element = xml_data.find('name')
+    if name_element is not None and name_element.string is not None:
+        name = name_element.string.strip()
+
+    vertices = xml_data.find_all('vertex')
+    num_nodes = len(vertices)
+    distances = array.array('d', [0.0]) * (num_nodes * num_nodes)
+    for i in range(0, num_nodes):
+        for edge in vertices[i].find_all('edge'):
+            distances[i * num_nodes + int(edge.string)] = round(
+                float(edge['cost']), precision)
+
+    return TSPInstance(name, num_nodes, precision, distances)
+
+
+def load_instance(source, cache: bool = False,
+                  cache_directory: str = None) -> TSPInstance:
+    """
+    Loads a TSP instance from any of the forms accepted by the ACO
+    algorithms.
+
+    Args:
+        source (str | TSPInstance | []): Either the path to a dataset (an
+            XML dataset or a TSPLIB .tsp coordinate dataset), an instance that
+            has already been loaded (returned unchanged) or XML data parsed by
+            BeautifulSoup.
+        cache (bool): Whether datasets are loaded through the compiled
+            instance cache in instance_cache, which memory maps a compiled
+            copy of the dataset rather than parsing it again.
+        cache_directory (str): The directory used by the cache, None uses the
+            default cache directory.
+
+    Returns:
+        instance (TSPInstance): The loaded instance.
+    """
+    if isinstance(source, TSPInstance):
+        return source
+    if hasattr(source, 'find_all'):
+        return from_beautiful_soup(source)
+
+    # Coordinate datasets already load in O(n) time, so they are not cached
+    if str(source).endswith(".tsp"):
+        return parse_tsplib(str(source))
+
+    if cache:
+        # Imported here as the cache itself uses this module to parse
+        # datasets
+        from instance_cache import load_cached_instance
+        return load_cached_instance(str(source), cache_directory)
+
+    return parse_xml(str(source))
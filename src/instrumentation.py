@@ -0,0 +1,87 @@
+"""Measures where the time goes within the iterations of the ACO algorithms"""
+import contextlib
+import time
+
+# The counters recorded by construct_path, in the order they are reported
+PATH_COUNTERS = ("candidate_scans", "candidate_fallbacks", "roulette_draws",
+                 "random_fallbacks", "fenwick_draws", "fenwick_fallbacks")
+
+
+class Instrumentation:
+    """
+    Cumulative high resolution timers for each phase of an iteration, and
+    counters of the events in the hot path of building the ants' paths. An
+    instance is passed to ant_colony_optimisation_algorithm to turn
+    instrumentation on, when it is not passed nothing is timed or counted.
+
+    The phases timed are initialisation (loading the graph and building the
+    heuristic matrix and candidate lists), choice_info (calculating the
+    desirability of every edge), construction (building the paths), sharing
+    (copying the pheromone matrix to the worker processes of the parallel
+    engine), local_search (improving the paths with 2-opt and Or-opt, when it
+    is turned on), evaluation (tracking the best and average lengths),
+    selection, update, evaporation and migration (depositing the paths
+    received from other colonies by the island model).
+
+    Attributes:
+        timings ({str: float}): The total number of seconds spent in each
+            phase.
+        counters ({str: int}): The total number of times each event occurred,
+            including the number of fitness evaluations performed.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.counters = {}
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """
+        Times the code run inside a with statement, adding it to the phase's
+        total.
+
+        Args:
+            name (str): The name of the phase.
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = (self.timings.get(name, 0.0)
+                                  + time.perf_counter() - start_time)
+
+    def count(self, counters: {str: int}) -> None:
+        """
+        Adds a batch of event counts to the totals.
+
+        Args:
+            counters ({str: int}): The number of times each event occurred.
+        """
+        for (name, amount) in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self) -> dict:
+        """
+        Returns:
+            report (dict): The timings and counters, ready to be written as
+                JSON.
+        """
+        return {"timings": dict(self.timings),
+                "counters": dict(self.counters)}
+
+
+def phase(instrumentation: Instrumentation, name: str):
+    """
+    Args:
+        instrumentation (Instrumentation): The instrumentation of the run, or
+            None if it is turned off.
+        name (str): The name of the phase.
+
+    Returns:
+        context: A context manager timing the phase, which does nothing when
+            instrumentation is turned off.
+    """
+    if instrumentation is None:
+        return contextlib.nullcontext()
+
+    return instrumentation.phase(name)
@@ -0,0 +1,295 @@
+"""Runs several ACO colonies in separate processes, exchanging best paths"""
+import argparse
+import collections
+import json
+import math
+import multiprocessing
+import queue
+import random
+from instance_loader import load_instance
+from run_batch import (ALGORITHMS, add_algorithm_arguments,
+                       algorithm_arguments, create_policy)
+from tsp_aco_algorithm import Tour, iterate_colony
+
+# The ways the islands can be connected: each island sending its best path
+# to the next island in a ring, or to every other island
+TOPOLOGIES = ("ring", "fully_connected")
+# The number of seconds an island is given to exit once its result has been
+# received, before it is terminated
+JOIN_TIMEOUT = 30
+
+
+def island_neighbours(topology: str, num_islands: int) -> [[int]]:
+    """
+    Args:
+        topology (str): How the islands are connected, one of TOPOLOGIES.
+        num_islands (int): The number of islands.
+
+    Returns:
+        neighbours ([[int]]): The islands each island sends its best path to.
+    """
+    if topology == "ring":
+        return [[(i + 1) % num_islands] if num_islands > 1 else []
+                for i in range(0, num_islands)]
+    elif topology == "fully_connected":
+        return [[j for j in range(0, num_islands) if j != i]
+                for i in range(0, num_islands)]
+
+    raise ValueError("Unknown topology: " + str(topology))
+
+
+def run_island(island: int, file_path: str, algorithm: str,
+               arguments: tuple, policy_arguments: tuple, options: dict,
+               seed: str, migration_interval: int, senders: [int],
+               receivers: [int], inboxes: [multiprocessing.Queue],
+               results: multiprocessing.Queue) -> None:
+    """
+    Runs a single colony in its own process, with its own pheromone matrix.
+    Every migration_interval iterations it sends its best path to the islands
+    it sends to that are still running, and then waits for the best paths of
+    the running islands sending to it, which deposit pheromone in this
+    colony. Migration is synchronous, so a seeded run always gives the same
+    result.
+
+    When the colony stops it tells every island it sends to or receives from,
+    so no island waits for it or keeps sending it paths. It then keeps
+    reading its inbox until every island sending to it has stopped, so no
+    island is left unable to exit with paths nobody will read stuck in its
+    queue.
+
+    Args:
+        island (int): The index of this island.
+        file_path (str): The path to the dataset.
+        algorithm (str): The variant run by this island, one of ALGORITHMS.
+        arguments (tuple): The arguments passed to iterate_colony after the
+            dataset.
+        policy_arguments (tuple): The arguments passed to create_policy after
+            the variant.
+        options (dict): The keyword arguments passed to iterate_colony.
+        seed (str): The seed of this island.
+        migration_interval (int): The number of iterations between
+            migrations.
+        senders ([int]): The islands that send their best paths to this one.
+        receivers ([int]): The islands this island sends its best path to.
+        inboxes ([multiprocessing.Queue]): The inbox of every island, where
+            it receives paths and the messages of islands that have stopped.
+        results (multiprocessing.Queue): Where this island's result is put
+            once it has stopped.
+    """
+    inbox = inboxes[island]
+    # The messages received from each sender but not yet used, as a fast
+    # sender can be one migration ahead of a slow one
+    pending = {sender: collections.deque() for sender in senders}
+    # The islands whose message saying they have stopped has arrived, and
+    # the senders whose paths have all been used
+    stopped = set()
+    finished_senders = set()
+
+    def receive(block: bool) -> bool:
+        """
+        Reads one message from the inbox, an island that has stopped sending
+        None.
+
+        Args:
+            block (bool): Whether to wait for a message to arrive.
+
+        Returns:
+            received (bool): Whether a message was read, False if the inbox
+                was empty and block is False.
+        """
+        try:
+            (source, message) = inbox.get(block)
+        except queue.Empty:
+            return False
+        if message is None:
+            stopped.add(source)
+        if source in pending:
+            pending[source].append(message)
+        return True
+
+    random.seed(seed)
+    best_fitness = math.inf
+    best_path = []
+    average_solution_tracker = []
+    stop_reason = "evaluations"
+    colony = None
+
+    try:
+        instance = load_instance(file_path, cache=True)
+        policy = create_policy(algorithm, *policy_arguments)
+        colony = iterate_colony(instance, *arguments, policy=policy,
+                                **options)
+
+        statistics = next(colony, None)
+        while statistics is not None:
+            best_fitness = statistics.best_fitness
+            if statistics.best_path is not None:
+                best_path = statistics.best_path
+            if statistics.num_ants == arguments[0]:
+                average_solution_tracker.append(statistics.mean_length)
+            if statistics.stop_reason is not None:
+                stop_reason = statistics.stop_reason
+                break
+
+            migrants = None
+            if statistics.iteration % migration_interval == 0:
+                # Any islands that have stopped are found first, so no paths
+                # are sent to them
+                while receive(False):
+                    pass
+
+                # Only the path and its length are sent between processes
+                for receiver in receivers:
+                    if receiver not in stopped:
+                        inboxes[receiver].put(
+                            (island, (list(best_path), best_fitness)))
+
+                migrants = []
+                for sender in senders:
+                    if sender in finished_senders:
+                        continue
+                    while len(pending[sender]) == 0:
+                        receive(True)
+                    message = pending[sender].popleft()
+                    if message is None:
+                        finished_senders.add(sender)
+                    else:
+                        migrants.append(Tour(message[0], message[1]))
+
+            try:
+                statistics = colony.send(migrants)
+            except StopIteration:
+                statistics = None
+    except BaseException as error:
+        # The error is passed on, so run_islands does not wait forever for
+        # this island's result
+        results.put((island, None, None, None, repr(error)))
+        raise
+    finally:
+        if colony is not None:
+            colony.close()
+        for neighbour in set(senders) | set(receivers):
+            inboxes[neighbour].put((island, None))
+        # Paths may still be sent to this island until each sender learns
+        # it has stopped, so they are read until every sender has stopped
+        while not stopped.issuperset(senders):
+            receive(True)
+
+    results.put((island, best_fitness, list(best_path),
+                 average_solution_tracker, stop_reason))
+
+
+def run_islands(file_path: str,
+                algorithm: str,
+                arguments: tuple,
+                policy_arguments: tuple,
+                options: dict = None,
+                num_islands: int = 4,
+                migration_interval: int = 10,
+                topology: str = "ring",
+                seed: int = 0) -> (float, [int], [tuple]):
+    """
+    Runs several colonies of a variant at once, one per process, each with
+    its own pheromone matrix. Every migration_interval iterations each
+    colony sends its best path to its neighbours in the topology, where it
+    deposits pheromone as if it had been found by that colony. Only paths
+    are sent between processes, so each migration costs O(n) per path no
+    matter the size of the pheromone matrix. Exchanging paths keeps the
+    colonies from all stagnating on the same path while still letting good
+    paths spread.
+
+    Args:
+        file_path (str): The path to the dataset, loaded by every island
+            through the compiled instance cache.
+        algorithm (str): The variant run by every island, one of ALGORITHMS.
+        arguments (tuple): The arguments passed to iterate_colony after the
+            dataset (m, q, alpha, beta, starting_node and evaporation_rate).
+        policy_arguments (tuple): The elite proportion, upper bound and lower
+            bound passed to create_policy.
+        options (dict): The keyword arguments passed to iterate_colony, the
+            fitness evaluations are those of each island.
+        num_islands (int): The number of colonies, each run in its own
+            process.
+        migration_interval (int): The number of iterations between
+            migrations.
+        topology (str): Which islands send their best paths to which, one of
+            TOPOLOGIES.
+        seed (int): The seed of the run, each island being seeded with
+            "seed:island".
+
+    Returns:
+        (best_fitness,
+        best_path,
+        island_results) (float, [int], [tuple]): The best fitness found by any
+            island, its path, and for each island its best fitness, best
+            path, average solution length at each iteration and the reason
+            it stopped.
+
+    Raises:
+        RuntimeError: If any island fails.
+    """
+    if options is None:
+        options = {}
+    neighbours = island_neighbours(topology, num_islands)
+    senders = [[j for j in range(0, num_islands) if i in neighbours[j]]
+               for i in range(0, num_islands)]
+
+    inboxes = [multiprocessing.Queue() for i in range(0, num_islands)]
+    results = multiprocessing.Queue()
+    processes = []
+    for island in range(0, num_islands):
+        process = multiprocessing.Process(
+            target=run_island,
+            args=(island, file_path, algorithm, arguments, policy_arguments,
+                  options, str(seed) + ":" + str(island), migration_interval,
+                  senders[island], neighbours[island], inboxes, results))
+        process.start()
+        processes.append(process)
+
+    try:
+        # The results are collected before joining, as a process cannot
+        # exit until everything it has put on a queue has been read
+        island_results = [None] * num_islands
+        for i in range(0, num_islands):
+            result = results.get()
+            if result[1] is None:
+                raise RuntimeError("Island " + str(result[0]) + " failed: "
+                                   + result[4])
+            island_results[result[0]] = result[1:]
+        for process in processes:
+            process.join(JOIN_TIMEOUT)
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    best = min(range(0, num_islands),
+               key=lambda island: island_results[island][0])
+
+    return (island_results[best][0], island_results[best][1], island_results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Runs several ACO colonies in separate processes, "
+        + "exchanging their best paths, and prints the result as JSON.")
+    parser.add_argument("instance", help="The path to the dataset.")
+    parser.add_argument("--algorithm", default="aco", choices=ALGORITHMS)
+    parser.add_argument("--islands", type=int, default=4)
+    parser.add_argument("--migration-interval", type=int, default=10)
+    parser.add_argument("--topology", default="ring", choices=TOPOLOGIES)
+    parser.add_argument("--seed", type=int, default=0)
+    add_algorithm_arguments(parser)
+    args = parser.parse_args()
+
+    (arguments, policy_arguments, options) = algorithm_arguments(args)
+    (best_fitness, best_path, island_results) = run_islands(
+        args.instance, args.algorithm, arguments, policy_arguments, options,
+        args.islands, args.migration_interval, args.topology, args.seed)
+
+    print(json.dumps({
+        "best_fitness": best_fitness,
+        "best_path": best_path,
+        "islands": [{"best_fitness": result[0], "stop_reason": result[3]}
+                    for result in island_results],
+    }, indent=2))
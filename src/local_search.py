@@ -0,0 +1,252 @@
+"""Improves the paths found by the ants with 2-opt and Or-opt local search"""
+import collections
+
+# The length of the longest segment moved by an Or-opt move
+MAX_SEGMENT_LENGTH = 3
+# Moves must shorten the path by more than this to be made, so rounding
+# errors can never cause moves to be made forever
+EPSILON = 1e-9
+
+
+def improve_path(path: [int], graph: [[float]], neighbours: [[int]],
+                 counters: {str: int} = None) -> ([int], float):
+    """
+    Shortens a path with 2-opt moves (replacing two edges by reversing the
+    section of the path between them) and Or-opt moves (moving a section of
+    up to three nodes elsewhere in the path), until neither can shorten it
+    any further. Each move is evaluated from the change in length of the
+    edges it replaces, only moves joining a node to one of its nearest
+    neighbours are considered, and don't-look bits skip nodes whose
+    surroundings have not changed since they were last checked. Together
+    these make each pass near linear in the number of nodes. The graph is
+    assumed to be symmetric, as reversing a section of the path would
+    otherwise change its length.
+
+    Args:
+        path ([int]): The path taken by an ant, starting and ending at the
+            same node.
+        graph ([[float]]): A 2D array representing the graph the ants are
+            traversing.
+        neighbours ([[int]]): The nearest neighbours of each node, in
+            ascending order of distance, as built by nearest_neighbour_lists.
+        counters ({str: int}): If provided, the number of two_opt_moves and
+            or_opt_moves made is added to it.
+
+    Returns:
+        (path, length) ([int], float): The improved path, still starting and
+            ending at the same node as the original, and its length.
+    """
+    starting_node = path[0]
+    # The path is treated as a cycle, without the repeated final node
+    tour = list(path[:-1])
+    num_nodes = len(tour)
+
+    if num_nodes >= 5:
+        position = [0] * len(graph)
+        for i in range(0, num_nodes):
+            position[tour[i]] = i
+
+        # Every node starts with its don't-look bit off, so it is queued to
+        # be checked. A node's bit is turned off again (and the node
+        # queued) whenever one of its edges changes
+        queue = collections.deque(tour)
+        queued = bytearray(len(graph))
+        for node in tour:
+            queued[node] = 1
+
+        def wake(nodes: [int]) -> None:
+            for node in nodes:
+                if not queued[node]:
+                    queued[node] = 1
+                    queue.append(node)
+
+        while len(queue) > 0:
+            node = queue.popleft()
+            queued[node] = 0
+
+            changed = two_opt_move(tour, position, graph, neighbours, node)
+            if changed is not None:
+                if counters is not None:
+                    counters["two_opt_moves"] = counters.get(
+                        "two_opt_moves", 0) + 1
+                wake(changed)
+                continue
+
+            changed = or_opt_move(tour, position, graph, neighbours, node)
+            if changed is not None:
+                if counters is not None:
+                    counters["or_opt_moves"] = counters.get(
+                        "or_opt_moves", 0) + 1
+                wake(changed)
+
+    # The path is rotated so it starts and ends at its original node again
+    start = tour.index(starting_node)
+    tour = tour[start:] + tour[:start]
+    tour.append(starting_node)
+
+    length = 0
+    for i in range(1, len(tour)):
+        length += graph[tour[i-1]][tour[i]]
+
+    return (tour, length)
+
+
+def reverse(tour: [int], position: [int], i: int, j: int) -> None:
+    """
+    Reverses the section of the tour between positions i and j (inclusive),
+    where i <= j, keeping the position of each node up to date.
+    """
+    while i < j:
+        (tour[i], tour[j]) = (tour[j], tour[i])
+        position[tour[i]] = i
+        position[tour[j]] = j
+        i += 1
+        j -= 1
+
+
+def two_opt_move(tour: [int], position: [int], graph: [[float]],
+                 neighbours: [[int]], a: int) -> [int]:
+    """
+    Looks for a 2-opt move that replaces one of the edges on either side of
+    node a with an edge from a to one of its nearest neighbours, c, and makes
+    the first one found that shortens the tour.
+
+    Args:
+        tour ([int]): The tour, as a cycle without a repeated final node.
+        position ([int]): The index of each node in the tour.
+        graph ([[float]]): A 2D array representing the graph.
+        neighbours ([[int]]): The nearest neighbours of each node.
+        a (int): The node the move is made from.
+
+    Returns:
+        changed ([int]): The nodes whose edges were changed by the move, or
+            None if no move shortens the tour.
+    """
+    num_nodes = len(tour)
+    for successor in (True, False):
+        # The node after (or before) a in the tour
+        if successor:
+            a_next = tour[(position[a] + 1) % num_nodes]
+        else:
+            a_next = tour[(position[a] - 1) % num_nodes]
+        removed = graph[a][a_next]
+
+        for c in neighbours[a]:
+            # The neighbours are in ascending order of distance, so once the
+            # new edge is no shorter than the edge it replaces no later
+            # neighbour can lead to a shorter tour
+            added = graph[a][c]
+            if added >= removed:
+                break
+
+            if successor:
+                c_next = tour[(position[c] + 1) % num_nodes]
+            else:
+                c_next = tour[(position[c] - 1) % num_nodes]
+            if c_next == a or c == a_next:
+                continue
+
+            delta = added + graph[a_next][c_next] - removed - graph[c][c_next]
+            if delta < -EPSILON:
+                # The edges (a, a_next) and (c, c_next) are replaced by
+                # (a, c) and (a_next, c_next) by reversing the section of the
+                # tour between them
+                i = position[a]
+                j = position[c]
+                if successor:
+                    if i < j:
+                        reverse(tour, position, i + 1, j)
+                    else:
+                        reverse(tour, position, j + 1, i)
+                else:
+                    if i < j:
+                        reverse(tour, position, i, j - 1)
+                    else:
+                        reverse(tour, position, j, i - 1)
+
+                return [a, a_next, c, c_next]
+
+    return None
+
+
+def or_opt_move(tour: [int], position: [int], graph: [[float]],
+                neighbours: [[int]], a: int) -> [int]:
+    """
+    Looks for an Or-opt move that takes the section of up to
+    MAX_SEGMENT_LENGTH nodes starting at node a out of the tour and inserts
+    it next to one of a's nearest neighbours, c, either way round, and makes
+    the first one found that shortens the tour.
+
+    Args:
+        tour ([int]): The tour, as a cycle without a repeated final node.
+        position ([int]): The index of each node in the tour.
+        graph ([[float]]): A 2D array representing the graph.
+        neighbours ([[int]]): The nearest neighbours of each node.
+        a (int): The first node of the section that is moved.
+
+    Returns:
+        changed ([int]): The nodes whose edges were changed by the move, or
+            None if no move shortens the tour.
+    """
+    num_nodes = len(tour)
+    start = position[a]
+    for segment_length in range(1, min(MAX_SEGMENT_LENGTH,
+                                       num_nodes - 3) + 1):
+        segment = [tour[(start + k) % num_nodes]
+                   for k in range(0, segment_length)]
+        e = segment[-1]
+        p = tour[(start - 1) % num_nodes]
+        f = tour[(start + segment_length) % num_nodes]
+        # The length saved by taking the section out and joining p to f
+        removed = graph[p][a] + graph[e][f] - graph[p][f]
+
+        for c in neighbours[a]:
+            if graph[c][a] >= removed:
+                break
+            if c in segment:
+                continue
+
+            # The section can either follow c, running from a to e, or
+            # precede c, running from e to a, so a is always next to c
+            c_next = tour[(position[c] + 1) % num_nodes]
+            c_previous = tour[(position[c] - 1) % num_nodes]
+            if c_next not in segment:
+                added = graph[c][a] + graph[e][c_next] - graph[c][c_next]
+                if added - removed < -EPSILON:
+                    move_segment(tour, position, segment, c, segment, True)
+                    return [p, f, a, e, c, c_next]
+            if c_previous not in segment:
+                added = (graph[c_previous][e] + graph[a][c]
+                         - graph[c_previous][c])
+                if added - removed < -EPSILON:
+                    move_segment(tour, position, segment, c,
+                                 segment[::-1], False)
+                    return [p, f, a, e, c, c_previous]
+
+    return None
+
+
+def move_segment(tour: [int], position: [int], segment: [int], c: int,
+                 inserted: [int], after: bool) -> None:
+    """
+    Moves a section of the tour next to node c, rebuilding the tour and the
+    position of each node.
+
+    Args:
+        tour ([int]): The tour, as a cycle without a repeated final node.
+        position ([int]): The index of each node in the tour.
+        segment ([int]): The nodes being moved, in their current order.
+        c (int): The node the section is moved next to.
+        inserted ([int]): The nodes being moved, in their new order.
+        after (bool): Whether the section is inserted after c, rather than
+            before it.
+    """
+    moving = set(segment)
+    remaining = [node for node in tour if node not in moving]
+    index = remaining.index(c)
+    if after:
+        index += 1
+
+    tour[:] = remaining[:index] + inserted + remaining[index:]
+    for i in range(0, len(tour)):
+        position[tour[i]] = i
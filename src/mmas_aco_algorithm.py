@@ -1,16 +1,17 @@
 """Solves the TSP using a Max-Min Ant System"""
+import tsp_aco_algorithm
 from tsp_aco_algorithm import *
 
 
-def evaporate_pheromone(t: [[float]],
+def evaporate_pheromone(t: PheromoneMatrix,
                         evaporation_rate: float,
-                        lower_bound: int) -> [[float]]:
+                        lower_bound: int) -> PheromoneMatrix:
     """
     Evaporates (reduces by some multiple) the pheromone value of every edge
     stored in the pheromone matrix supplied to it.
 
     Args:
-        t ([[float]]): The pheromone matrix being used by the ACO, which
+        t (PheromoneMatrix): The pheromone matrix being used by the ACO, which
             stores a float value for each edge in the graph indicating the
             amount of pheromone on it.
         evaporation_rate: Determines the amount of pheromone that's evaporated
@@ -20,22 +21,21 @@ def evaporate_pheromone(t: [[float]],
             in the pheromone matrix can contain. Stored as an int for ease.
 
     Returns:
-        t ([[float]]): Returns the updated pheromone matrix once all the
+        t (PheromoneMatrix): Returns the updated pheromone matrix once all the
             values stored in it have been evaporated.
     """
-    # Loop through every index in the pheromone matrix and multiply its value
-    # By the evaporation rate
-    for i in range(0, len(t[0])):
-        for j in range(0, len(t[0])):
-            # If evaporating the pheromone would reduce its value to below
-            # the lower bound, the pheromone is set to the lower_bound value
-            t[i][j] = max((1-evaporation_rate) * t[i][j], lower_bound)
+    # Every edge is multiplied by the same value, so the matrix only has to
+    # update its scale factor. If evaporating the pheromone would reduce its
+    # value to below the lower bound, the pheromone is read as the
+    # lower_bound value instead
+    t.evaporate(evaporation_rate, lower_bound)
 
     return t
 
 
-def update_pheromone(graph: [[float]], paths: [[int]], t: [[float]],
-                     q: int, upper_bound: int) -> [[float]]:
+def update_pheromone(graph: [[float]], paths: [[int]], t: PheromoneMatrix,
+                     q: int, upper_bound: int,
+                     symmetric: bool = False) -> PheromoneMatrix:
     """
     Updates the pheromone value for each edge in the pheromone matrix that was
     used in the path taken by an ant, the update value is proportional to
@@ -49,33 +49,67 @@ def update_pheromone(graph: [[float]], paths: [[int]], t: [[float]],
         paths ([[int]]): A 2D array storing the paths taken by each ant in the
             colony during the last iteration. Storing them this way allows for
             each path to be easily accessed and manipulated.
-        t ([[float]]): The pheromone matrix being used by the ACO, which
+        t (PheromoneMatrix): The pheromone matrix being used by the ACO, which
             stores a float value for each edge in the graph indicating the
             amount of pheromone on it.
         q (int): A fixed local heuristic value for to reward paths
             proportionally to their fitness value. An integer for ease of use.
         upper_bound (int): The largest amount of pheromone that a given edge
             in the pheromone matrix can contain. Stored as an int for ease.
+        symmetric (bool): Whether pheromone is also deposited on the reverse
+            of each edge, for symmetric instances.
 
     Returns:
-        t ([[float]]): Returns the updated pheromone matrix once all edges
-            which were used in the prior iteration had their value updated.
+        t (PheromoneMatrix): Returns the updated pheromone matrix once all
+            edges which were used in the prior iteration had their value
+            updated.
 
     """
+    # The amount each path deposits on its edges is proportional to its
+    # fitness, which tours already carry
+    weights = [q/tour_length(graph, path) for path in paths]
 
-    # For every path taken by the ants
-    for i in range(0, len(paths)):
-        # Find its fitness and update every corresponding edge in the
-        # Pheromone matrix by a proportional value
-        fitness = path_length(graph, paths[i])
-        for j in range(1, len(paths[i])):
-            # If updating the pheromone would increase the value above the
-            # upper bound, the pheromone value is set to the upper_bound value
-            t[paths[i][j-1]][paths[i][j]] += min(q/fitness, upper_bound)
+    # Every edge of every path is updated in a single scatter-add
+    # If a path would deposit more than the upper bound, it deposits the
+    # upper_bound value instead
+    t.deposit(paths, weights, symmetric, upper_bound)
 
     return t
 
 
+class MaxMinPolicy(AntSystemPolicy):
+    """
+    The pheromone update rules of the Max-Min Ant System, where the pheromone
+    an ant deposits on an edge is capped at an upper bound and evaporation
+    never reduces an edge's pheromone below a lower bound.
+
+    Attributes:
+        upper_bound (int): The largest amount of pheromone that any given edge
+            in the pheromone matrix can have.
+        lower_bound (int): The smallest amount of pheromone that any given
+            edge in the pheromone matrix can have.
+    """
+
+    def __init__(self, upper_bound: int, lower_bound: int):
+        self.upper_bound = upper_bound
+        self.lower_bound = lower_bound
+
+    def update_pheromone(self, graph: [[float]], paths: [[int]],
+                         t: PheromoneMatrix, q: int) -> PheromoneMatrix:
+        """
+        Deposits pheromone on the edges of each selected path, see
+        update_pheromone.
+        """
+        return update_pheromone(graph, paths, t, q, self.upper_bound)
+
+    def evaporate_pheromone(self, t: PheromoneMatrix,
+                            evaporation_rate: float) -> PheromoneMatrix:
+        """
+        Evaporates the pheromone on every edge, see evaporate_pheromone.
+        """
+        return evaporate_pheromone(t, evaporation_rate, self.lower_bound)
+
+
 def ant_colony_optimisation_algorithm(xml_data: [],
                                       m: int,
                                       q: int,
@@ -84,25 +118,18 @@ def ant_colony_optimisation_algorithm(xml_data: [],
                                       starting_node: int,
                                       evaporation_rate: float,
                                       upper_bound: int,
-                                      lower_bound: int
+                                      lower_bound: int,
+                                      **options
                                       ) -> (float, [int], float):
     """
-    The main algorithm for the ant colony optimisation method. After the graph
-    has been initialised it loops through 10,000 fitness evaluations,
-    placing the ants on the graph at the specified start node and having them
-    traverse through the graph. When choosing the next node to visit, each
-    valid edge moving from the current edge is assigned a desiribility value.
-    After each ant in the colony (population) has completed its path, the
-    pheromone matrix is updated then evaporated according to a specified
-    evaporation rate. This process then repeats until 10,000 fitness
-    evaluations have been reached. Note the best fitness value and
-    corresponding path taken are tracked throughout the entire process.
-    All the parameters which influence the program are taken as arguments.
+    Runs the Max-Min Ant System, using the shared algorithm in
+    tsp_aco_algorithm with the MMAS pheromone update rules.
 
     Args:
-        xml_data ([]): The raw data extracted from the provided XML datasets,
-            used to find the nodes in the graph and the connections between
-            them. BeautifulSoup extracts this as a list.
+        xml_data (str | TSPInstance | []): The dataset used to find the nodes
+            in the graph and the connections between them. Either the path to
+            the dataset, an instance already loaded by load_instance or the
+            raw XML data extracted by BeautifulSoup.
         m (int): The colony size, this is the number of ants that traverse
             the graph in each iteration. Stored as an int as you can only have
             a whole number of ants. Base value of 10.
@@ -125,6 +152,10 @@ def ant_colony_optimisation_algorithm(xml_data: [],
             in the pheromone matrix can have. An integer for ease of use.
         lower_bound (int): The smallest amount of pheromone that any given
             edge in the pheromone matrix can have. An integer for ease of use.
+        **options: Any of the keyword arguments accepted by
+            tsp_aco_algorithm.ant_colony_optimisation_algorithm, such as
+            engine, candidate_lists or the termination criteria
+            (time_limit, target_fitness and stagnation_limit).
 
     Returns:
         (best_fitness,
@@ -132,167 +163,12 @@ def ant_colony_optimisation_algorithm(xml_data: [],
         average_solution_tracker) (float, [int], [float]): Returns a tuple
             storing the best fitness found, its accompanying path and the
             average solution length found at each iteration (only used for
-            matplotlib).
+            matplotlib). If return_reason is passed, the reason the algorithm
+            stopped is added to the end of the tuple.
     """
-    # The paths taken by each of the ants
-    paths = []
-    # The best fitness found thus far
-    best_fitness = math.inf
-    # The path associated with this best fitness value
-    best_path = []
-    # The index representing the current node being looked at
-    current_node = starting_node
-    # Used to help track the convergence characterisitcs of the algorithm
-    # (enables matplot lib to plot the convergence behaviour)
-    average_solution_tracker = []
-
-    # Initialise the graph and pheromone matrix
-    (graph, t) = initialisation(xml_data)
-    accuracy = xml_data.find_all('doublePrecision')
-    accuracy = int(accuracy[0].string)
-
-    # Initialise the heuristic matrix
-    # Each index in the graph stores num_nodes edges, so it can be used to
-    # size the heuristic matrix
-    heuristic_matrix = [0] * len(graph[0])
-    # Initialised so that every index holds a placeholder value of 0
-    for i in range(0, len(graph[0])):
-        heuristic_matrix[i] = [0] * len(graph[0])
-
-    # Loop through each element in the heuristic matrix
-    for j in range(0, len(heuristic_matrix[0])):
-        for k in range(0, len(heuristic_matrix[0])):
-            # If the index is on the leading diagonal it remains 0
-            if j != k:
-                # Otherwise the index = 1/ edge length
-                heuristic_matrix[j][k] = round((1/graph[j][k]), accuracy)
-
-    # Used for tracking in Matplotlib
-    iteration = 0
-    # Stop executing the algorithm after 10,000 fitness evaluations
-    fitness_evaluations = 0
-    while fitness_evaluations < 10_000:
-        # For every fitness evaluation re-initialise the array storing the
-        # paths taken by the ants
-        paths = [0] * m
-        for a in range(0, m):
-            paths[a] = []
-
-        # For consistency sake, the starting node is always set to 0 at the
-        # start of each iteration
-        starting_node = 0
-        # Finds a path through the graph with each ant
-        for ant in range(0, m):
-            # If the number of fitness evaluations has been surpassed break
-            # out the loop
-            if fitness_evaluations > 10_000:
-                break
-
-            # Create a copy of the heuristic matrix so it can be used
-            # without impacting the original
-            H = copy.deepcopy(heuristic_matrix)
-            # Reset the current node being looked at to the starting node
-            current_node = starting_node
-            # Creates an array to store the nodes that must still be visited
-            nodes = []
-            for c in range(0, len(graph[0])):
-                nodes.append(c)
-
-            # Add the starting node to the path taken
-            paths[ant].append(current_node)
-            # Remove the starting node from the list of nodes to visit
-            nodes.remove(current_node)
-
-            # Traverses until there are no more nodes to visit
-            while len(nodes) > 0:
-                # Remove the current node from the heuristic matrix
-                # For all ants this will initially be the starting node
-                for d in range(0, len(H[0])):
-                    H[d][current_node] = 0
-
-                # Calculate the transition (desirability) probabilities
-                # Start by calculating the numerator values for each edge, as
-                # well as the sum of these numerators
-                sum = 0
-                numerators = [0] * len(H[0])
-                for e in range(0, len(H[0])):
-                    if e in nodes:
-                        # The numerator is the desirability of a given edge
-                        numerators[e] = ((t[current_node][e])**alpha) * (
-                                         (H[current_node][e])**beta)
-                        # The sum is the sum of the desirability of all edges
-                        # leaving the current node
-                        sum += numerators[e]
-
-                # If the sum is 0, randomly choose a node from the list of
-                # remaning nodes
-                if sum == 0:
-                    current_node = random.choice(nodes)
-                else:
-                    # Otherwise, find the probability of choosing each node
-                    # This is edge desirability/ total desirability
-                    probability = []
-                    for f in range(0, len(numerators)):
-                        probability.append(numerators[f]/sum)
-
-                    cumulative_probability = 0
-                    random_num = random.random()
-                    # Generate a random number, where the first edge whose
-                    # cumulative probability >= this value represents the
-                    # node to visit next
-                    for g in range(0, len(numerators)):
-                        cumulative_probability += probability[g]
-                        if cumulative_probability >= random_num:
-                            current_node = g
-                            break
-
-                # Add the next node to visit to the path taken
-                paths[ant].append(current_node)
-                # Remove the next node to visit from the list of unvisited
-                # nodes
-                nodes.remove(current_node)
-
-            # The ant must return to the starting node to complete the path
-            paths[ant].append(starting_node)
-
-            # Check if the ants current path is better than the global best
-            # If it is, update the best fitness value and best path taken
-            current_path_length = path_length(graph, paths[ant])
-            if current_path_length < best_fitness:
-                best_fitness = current_path_length
-                best_path = paths[ant]
-
-            # As the fitness of a solution has been evaluated, increment
-            fitness_evaluations += 1
-
-        # Once all the paths have been found for this iteration, update the
-        # pheromone values
-        t = update_pheromone(graph, paths, t, q, upper_bound)
-
-        # Once the pheromone matrix has been updated, evaporate the pheromone
-        # values
-        t = evaporate_pheromone(t, evaporation_rate, lower_bound)
-
-        iteration += 1
-
-        # Calculate the average path length for every iteration bar the last
-        # Fewer than normal paths taken skews the result.
-        if fitness_evaluations <= 10000:
-            average_length = 0
-            for path in paths:
-                average_length += path_length(graph, path)
-
-            average_length = average_length/m
-            # print("The average length of the paths in this iteration is:
-            #       ", average_length)
-            # print("The best path length found so far is:
-            #       ", best_fitness, "\n")
-            # Used for tracking convergence in Matplotlib
-            average_solution_tracker.append(average_length)
-
-    # print("The number of iterations this algorithm executed was:
-    #       ", iteration)
-    return (best_fitness, best_path, average_solution_tracker)
+    return tsp_aco_algorithm.ant_colony_optimisation_algorithm(
+        xml_data, m, q, alpha, beta, starting_node, evaporation_rate,
+        policy=MaxMinPolicy(upper_bound, lower_bound), **options)
 
 
 if __name__ == "__main__":
@@ -300,13 +176,9 @@ if __name__ == "__main__":
     FILE_NAME = str(input("What is the full name (incl extension)"
                           + " of the file to be used:"))
 
-    # Deconstructs the XML file to determine the number of nodes and the
-    # connections between each of the nodes
-    with open('../docs/' + FILE_NAME, 'r') as file:
-        file_data = file.read()
-
-    # Uses BeautifulSoup to extract the raw XML data for the whole file
-    xml_data = BeautifulSoup(file_data, 'xml')
+    # Loads the dataset, reading the nodes in the graph and the connections
+    # between each of the nodes in a single pass
+    xml_data = load_instance('../docs/' + FILE_NAME)
 
     # Executes the ACO with the given parameters and times its execution
     start_time = time.time()
@@ -0,0 +1,290 @@
+"""Solves the TSP using a batched NumPy ACO algorithm"""
+import random
+import time
+import numpy as np
+import tsp_aco_algorithm
+from instance_loader import load_instance
+from instrumentation import PATH_COUNTERS, Instrumentation, phase
+from pheromone_matrix import PheromoneMatrix
+from tsp_aco_algorithm import Tour, print_path
+
+
+def construct_paths(choice_info: np.ndarray,
+                    num_ants: int,
+                    starting_node: int,
+                    rng: np.random.Generator,
+                    candidate_mask: np.ndarray = None,
+                    counters: {str: int} = None) -> np.ndarray:
+    """
+    Builds the paths of every ant in the colony at once. At each step every
+    ant reads the row of the choice info matrix for the node it is currently
+    at, masks out the nodes it has already visited and then performs a
+    roulette wheel selection, all ants being handled by the same array
+    operations. If a candidate mask is provided, ants only consider the
+    unvisited candidates of their current node, falling back to every
+    unvisited node once all of the candidates have been visited.
+
+    Args:
+        choice_info (np.ndarray): An n x n array storing the desirability
+            (t**alpha * H**beta) of every edge for this iteration.
+        num_ants (int): The number of ants (paths) to construct.
+        starting_node (int): The index of the node every ant starts from.
+        rng (np.random.Generator): The random number generator used for the
+            roulette wheel selection.
+        candidate_mask (np.ndarray): An n x n boolean array, where row i marks
+            the nodes in node i's candidate list. None considers every
+            unvisited node.
+        counters ({str: int}): If provided, the number of times each event
+            in instrumentation.PATH_COUNTERS occurs is added to it.
+
+    Returns:
+        paths (np.ndarray): A num_ants x (n + 1) array of node indices, where
+            each row is the closed path taken by an ant.
+    """
+    num_nodes = choice_info.shape[0]
+    ants = np.arange(num_ants)
+
+    paths = np.empty((num_ants, num_nodes + 1), dtype=np.intp)
+    paths[:, 0] = starting_node
+    paths[:, -1] = starting_node
+    # Each ant has its own visited mask, so nothing has to be copied or
+    # zeroed in the shared choice info matrix
+    unvisited = np.ones((num_ants, num_nodes), dtype=bool)
+    unvisited[:, starting_node] = False
+    current_nodes = paths[:, 0]
+
+    for step in range(1, num_nodes):
+        # The nodes each ant may move to next, restricted to the unvisited
+        # candidates of its current node while any of these remain
+        allowed = unvisited
+        if candidate_mask is not None:
+            candidates = unvisited & candidate_mask[current_nodes]
+            has_candidates = candidates.any(axis=1)
+            allowed = np.where(has_candidates[:, None], candidates, unvisited)
+            if counters is not None:
+                counters["candidate_scans"] += num_ants
+                counters["candidate_fallbacks"] += int(
+                    num_ants - has_candidates.sum())
+
+        # The desirability of every edge leaving each ant's current node,
+        # with the edges to nodes that are not allowed removed
+        numerators = choice_info[current_nodes] * allowed
+        cumulative = np.cumsum(numerators, axis=1)
+        sums = cumulative[:, -1]
+
+        # The first node whose cumulative desirability exceeds the random
+        # value is chosen, nodes with no desirability can never be chosen as
+        # they do not increase the cumulative total
+        random_nums = rng.random(num_ants) * sums
+        chosen = cumulative > random_nums[:, None]
+        next_nodes = np.argmax(chosen, axis=1)
+        # Rounding can leave no cumulative total above the random value, in
+        # which case argmax would return the (visited) first node. The last
+        # node with any desirability is chosen instead, the first to reach
+        # the sum, as the Python roulette wheel does
+        overshot = ~chosen.any(axis=1)
+        if overshot.any():
+            next_nodes[overshot] = np.argmax(
+                cumulative[overshot] >= sums[overshot, None], axis=1)
+
+        # If the sum is 0, randomly choose one of the allowed nodes
+        stuck = sums <= 0
+        if stuck.any():
+            noise = rng.random((int(stuck.sum()), num_nodes))
+            next_nodes[stuck] = np.argmax(noise * allowed[stuck], axis=1)
+        if counters is not None:
+            counters["random_fallbacks"] += int(stuck.sum())
+            counters["roulette_draws"] += int(num_ants - stuck.sum())
+
+        paths[:, step] = next_nodes
+        unvisited[ants, next_nodes] = False
+        current_nodes = next_nodes
+
+    return paths
+
+
+class NumpyPathConstructor:
+    """
+    Builds the paths taken by the ants in each iteration all at once, using
+    construct_paths. Provides the same methods as
+    tsp_aco_algorithm.PathConstructor, so it can be used by
+    tsp_aco_algorithm.ant_colony_optimisation_algorithm for any variant of
+    the algorithm.
+    """
+
+    def __init__(self, graph: [[float]], heuristic_matrix: [[float]],
+                 alpha: float, starting_node: int, candidates: [[int]]):
+        self.graph = np.array(graph, dtype=float)
+        self.heuristic_matrix = np.array(heuristic_matrix, dtype=float)
+        self.alpha = alpha
+        self.starting_node = starting_node
+
+        # The candidate lists are stored as a mask so they can be applied to
+        # every ant at once
+        self.candidate_mask = None
+        if candidates is not None:
+            self.candidate_mask = np.zeros(self.heuristic_matrix.shape,
+                                           dtype=bool)
+            for i in range(0, len(candidates)):
+                self.candidate_mask[i, candidates[i]] = True
+
+        # The NumPy generator is seeded from the random module so that seeding
+        # random keeps runs reproducible
+        self.rng = np.random.default_rng(random.getrandbits(64))
+
+    def construct(self, t: PheromoneMatrix, num_ants: int,
+                  instrumentation: Instrumentation = None) -> [Tour]:
+        """
+        Args:
+            t (PheromoneMatrix): The pheromone matrix for this iteration.
+            num_ants (int): The number of ants whose paths are built.
+            instrumentation (Instrumentation): Times the choice_info and
+                construction phases and counts the events in building the
+                paths, None if instrumentation is turned off.
+
+        Returns:
+            paths ([Tour]): The path taken by each ant, with its length.
+        """
+        # The desirability of every edge is calculated once per iteration
+        with phase(instrumentation, "choice_info"):
+            pheromone = np.frombuffer(t.true_values(), dtype=float).reshape(
+                self.heuristic_matrix.shape)
+            choice_info = (pheromone ** self.alpha) * self.heuristic_matrix
+
+        counters = None
+        if instrumentation is not None:
+            counters = dict.fromkeys(PATH_COUNTERS, 0)
+
+        with phase(instrumentation, "construction"):
+            paths = construct_paths(choice_info, num_ants,
+                                    self.starting_node, self.rng,
+                                    self.candidate_mask, counters)
+            # The length of every path is found at once, adding up its edges
+            # in the order they were taken
+            lengths = np.cumsum(self.graph[paths[:, :-1], paths[:, 1:]],
+                                axis=1)[:, -1]
+
+        if instrumentation is not None:
+            instrumentation.count(counters)
+
+        return [Tour(path, length) for (path, length)
+                in zip(paths.tolist(), lengths.tolist())]
+
+    def get_state(self) -> dict:
+        """
+        Returns:
+            state (dict): The state of the engine that must be checkpointed
+                for a run to resume exactly, the state of its NumPy generator.
+        """
+        return {"rng": self.rng.bit_generator.state}
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores the state returned by get_state.
+        """
+        self.rng.bit_generator.state = state["rng"]
+
+    def close(self) -> None:
+        """
+        Releases any resources held by the engine, nothing for this engine.
+        """
+
+
+def ant_colony_optimisation_algorithm(xml_data: [],
+                                      m: int,
+                                      q: int,
+                                      alpha: float,
+                                      beta: int,
+                                      starting_node: int,
+                                      evaporation_rate: float,
+                                      report: bool = False,
+                                      **options
+                                      ) -> (float, [int], float):
+    """
+    A batched version of the ant colony optimisation algorithm. Rather than
+    building each ant's path one node at a time in Python, the desirability
+    of every edge is calculated once per iteration and all m ants traverse
+    the graph together, using a visited mask per ant and a vectorised roulette
+    wheel selection. The rest of the algorithm is shared with
+    tsp_aco_algorithm, so the elitist and MMAS variants are run by passing
+    their policy.
+
+    Args:
+        xml_data (str | TSPInstance | []): The dataset used to find the nodes
+            in the graph and the connections between them. Either the path to
+            the dataset, an instance already loaded by load_instance or the
+            raw XML data extracted by BeautifulSoup.
+        m (int): The colony size, this is the number of ants that traverse
+            the graph in each iteration.
+        q (int): A fixed local heuristic value for to reward paths
+            proportionally to their fitness value.
+        alpha (float): A pheromone importance factor that decreases/ increases
+            the weight pheromone has on an edge's desirability.
+        beta (int): A heuristic importance factor that decreases/ increases
+            the weight an edge's distance has on its desirabiility.
+        starting_node (int): The index representing the node the each ant will
+            start its path from.
+        evaporation_rate (float): The rate at which pheromone is evaporated
+            from the pheromone matrix after each iteration.
+        report (bool): Whether the number of fitness evaluations performed
+            per second is printed once the algorithm has finished.
+        **options: Any of the keyword arguments accepted by
+            tsp_aco_algorithm.ant_colony_optimisation_algorithm, such as
+            policy or candidate_lists.
+
+    Returns:
+        (best_fitness,
+        best_path,
+        average_solution_tracker) (float, [int], [float]): Returns a tuple
+            storing the best fitness found, its accompanying path and the
+            average solution length found at each iteration (only used for
+            matplotlib).
+    """
+    # The evaluations actually performed are counted by the instrumentation,
+    # as a termination criterion can stop the run early
+    if report and options.get("instrumentation") is None:
+        options["instrumentation"] = Instrumentation()
+    if report:
+        evaluations = options["instrumentation"].counters.get("evaluations", 0)
+
+    start_time = time.perf_counter()
+    result = tsp_aco_algorithm.ant_colony_optimisation_algorithm(
+        xml_data, m, q, alpha, beta, starting_node, evaporation_rate,
+        engine="numpy", **options)
+
+    if report:
+        elapsed = time.perf_counter() - start_time
+        evaluations = (options["instrumentation"].counters.get(
+            "evaluations", 0) - evaluations)
+        print("Evaluations per second:", evaluations/elapsed)
+
+    return result
+
+
+if __name__ == "__main__":
+    # Takes the name of the XML file to be used as input
+    FILE_NAME = str(input("What is the full name (incl extension)"
+                          + " of the file to be used:"))
+
+    # Loads the dataset, reading the nodes in the graph and the connections
+    # between each of the nodes in a single pass
+    xml_data = load_instance('../docs/' + FILE_NAME)
+
+    # Executes the batched ACO with the given parameters and times its
+    # execution
+    start_time = time.time()
+    (best_fitness,
+     best_path,
+     average_solution_tracker) = ant_colony_optimisation_algorithm(xml_data,
+                                                                   130,
+                                                                   500,
+                                                                   0.5,
+                                                                   9,
+                                                                   0,
+                                                                   0.3,
+                                                                   report=True)
+    end_time = time.time()
+
+    print("The best fitness found was:", best_fitness, "\n")
+    print("The best path found was:", print_path(best_path))
+    print("The time taken by this algorithm was:", end_time-start_time, "s")
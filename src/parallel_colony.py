@@ -0,0 +1,327 @@
+"""Solves the TSP using an ACO algorithm with ants split across processes"""
+import multiprocessing
+import os
+import random
+import time
+from multiprocessing import shared_memory
+import tsp_aco_algorithm
+from fenwick_sampler import FenwickSampler
+from instance_loader import load_instance
+from instrumentation import PATH_COUNTERS, Instrumentation, phase
+from pheromone_matrix import PheromoneMatrix
+from tsp_aco_algorithm import Tour, construct_path, print_path
+
+# The shared matrices and settings attached to by each worker process
+worker_state = {}
+
+
+class SharedChoiceInfo:
+    """
+    The choice info matrix (t**alpha * H**beta) of an iteration, read from the
+    pheromone and heuristic matrices held in shared memory. Each row is only
+    calculated the first time an ant in this process needs it, so no process
+    has to calculate rows its ants never visit.
+    """
+
+    def __init__(self, pheromone: memoryview, heuristic: memoryview,
+                 num_nodes: int, alpha: float):
+        self.pheromone = pheromone
+        self.heuristic = heuristic
+        self.num_nodes = num_nodes
+        self.alpha = alpha
+        self.rows = [None] * num_nodes
+
+    def __len__(self) -> int:
+        return self.num_nodes
+
+    def __getitem__(self, i: int) -> [float]:
+        row = self.rows[i]
+        if row is None:
+            start = i * self.num_nodes
+            end = start + self.num_nodes
+            alpha = self.alpha
+            row = [p**alpha * h for (p, h) in zip(self.pheromone[start:end],
+                                                  self.heuristic[start:end])]
+            self.rows[i] = row
+
+        return row
+
+
+def attach_worker(names: [str], num_nodes: int, alpha: float,
+                  starting_node: int, candidates: [[int]],
+                  sampler: str = "linear") -> None:
+    """
+    Attaches a worker process to the shared distance, heuristic and
+    pheromone matrices. Called once when each worker process starts.
+
+    Args:
+        names ([str]): The names of the shared memory blocks storing the
+            distance, heuristic and pheromone matrices, in that order.
+        num_nodes (int): The number of nodes in the graph.
+        alpha (float): The pheromone importance factor.
+        starting_node (int): The index of the node every ant starts from.
+        candidates ([[int]]): The candidate list of each node, or None.
+        sampler (str): How the next node is chosen, "linear" or "fenwick".
+    """
+    blocks = []
+    for name in names:
+        blocks.append(shared_memory.SharedMemory(name=name))
+
+    worker_state['blocks'] = blocks
+    worker_state['distances'] = blocks[0].buf.cast('d')
+    worker_state['heuristic'] = blocks[1].buf.cast('d')
+    worker_state['pheromone'] = blocks[2].buf.cast('d')
+    worker_state['num_nodes'] = num_nodes
+    worker_state['alpha'] = alpha
+    worker_state['starting_node'] = starting_node
+    worker_state['candidates'] = candidates
+    worker_state['sampler'] = sampler
+    worker_state['iteration'] = -1
+
+
+def construct_ants(task: tuple) -> ([[int]], [float], {str: int}):
+    """
+    Builds the paths of a share of the ants in an iteration, inside a worker
+    process.
+
+    Args:
+        task (tuple): The iteration number, the number of ants to build, the
+            seed used by this share of the ants and whether the events in
+            building the paths are counted.
+
+    Returns:
+        (paths, lengths, counters) ([[int]], [float], {str: int}): The path
+            taken by each ant, its length and the number of times each event
+            occurred (None if they were not counted).
+    """
+    (iteration, num_ants, seed, count) = task
+    # The pheromone matrix only changes between iterations, so the choice
+    # info rows calculated for it are kept until the next iteration
+    if worker_state['iteration'] != iteration:
+        worker_state['iteration'] = iteration
+        worker_state['choice_info'] = SharedChoiceInfo(
+            worker_state['pheromone'], worker_state['heuristic'],
+            worker_state['num_nodes'], worker_state['alpha'])
+        worker_state['fenwick'] = None
+        if worker_state['sampler'] == "fenwick":
+            worker_state['fenwick'] = FenwickSampler(
+                worker_state['choice_info'])
+
+    random.seed(seed)
+    distances = worker_state['distances']
+    num_nodes = worker_state['num_nodes']
+
+    counters = None
+    if count:
+        counters = dict.fromkeys(PATH_COUNTERS, 0)
+
+    paths = []
+    lengths = []
+    for ant in range(0, num_ants):
+        path = construct_path(worker_state['choice_info'],
+                              worker_state['starting_node'],
+                              worker_state['candidates'],
+                              sampler=worker_state['fenwick'],
+                              counters=counters)
+        fitness = 0
+        for i in range(1, len(path)):
+            fitness += distances[path[i-1] * num_nodes + path[i]]
+        paths.append(path)
+        lengths.append(fitness)
+
+    return (paths, lengths, counters)
+
+
+def share_matrix(values: [[float]]) -> shared_memory.SharedMemory:
+    """
+    Args:
+        values ([[float]]): A 2D array to copy into shared memory.
+
+    Returns:
+        block (SharedMemory): A new shared memory block storing the values
+            row by row as doubles.
+    """
+    num_nodes = len(values)
+    block = shared_memory.SharedMemory(create=True,
+                                       size=max(8 * num_nodes * num_nodes, 8))
+    view = block.buf.cast('d')
+    for i in range(0, num_nodes):
+        for j in range(0, num_nodes):
+            view[i * num_nodes + j] = values[i][j]
+    view.release()
+
+    return block
+
+
+class ParallelPathConstructor:
+    """
+    Builds the paths taken by the ants in each iteration by splitting the ants
+    between a pool of worker processes. The distance, heuristic and pheromone
+    matrices are stored in shared memory, so each iteration only the pheromone
+    matrix is copied into shared memory and only the paths taken by the ants
+    are sent back. Provides the same methods as
+    tsp_aco_algorithm.PathConstructor, so it can be used by
+    tsp_aco_algorithm.ant_colony_optimisation_algorithm for any variant of
+    the algorithm.
+    """
+
+    def __init__(self, graph: [[float]], heuristic_matrix: [[float]],
+                 alpha: float, starting_node: int, candidates: [[int]],
+                 workers: int = None, sampler: str = "linear"):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.workers = workers
+        self.num_nodes = len(graph)
+        self.iteration = 0
+
+        # The pheromone block is filled in at the start of each iteration
+        self.blocks = [share_matrix(graph), share_matrix(heuristic_matrix),
+                       share_matrix([[0.0] * self.num_nodes
+                                     for i in range(0, self.num_nodes)])]
+        self.pheromone = self.blocks[2].buf.cast('d')
+        self.pool = multiprocessing.Pool(
+            workers, initializer=attach_worker,
+            initargs=([block.name for block in self.blocks], self.num_nodes,
+                      alpha, starting_node, candidates, sampler))
+
+    def construct(self, t: PheromoneMatrix, num_ants: int,
+                  instrumentation: Instrumentation = None) -> [Tour]:
+        """
+        Args:
+            t (PheromoneMatrix): The pheromone matrix for this iteration.
+            num_ants (int): The number of ants whose paths are built.
+            instrumentation (Instrumentation): Times the sharing and
+                construction phases and counts the events in building the
+                paths, None if instrumentation is turned off.
+
+        Returns:
+            paths ([Tour]): The path taken by each ant, with its length.
+        """
+        # The true pheromone values are copied into shared memory in one go
+        with phase(instrumentation, "sharing"):
+            self.pheromone[:] = t.true_values()
+
+        # Shares the ants out between the workers as evenly as possible, each
+        # share being given its own seed from this process
+        tasks = []
+        for worker in range(0, self.workers):
+            share = num_ants // self.workers
+            if worker < num_ants % self.workers:
+                share += 1
+            if share > 0:
+                tasks.append((self.iteration, share, random.getrandbits(64),
+                              instrumentation is not None))
+
+        paths = []
+        with phase(instrumentation, "construction"):
+            results = self.pool.map(construct_ants, tasks)
+        for (worker_paths, worker_lengths, counters) in results:
+            paths.extend([Tour(path, length) for (path, length)
+                          in zip(worker_paths, worker_lengths)])
+            if instrumentation is not None:
+                instrumentation.count(counters)
+        self.iteration += 1
+
+        return paths
+
+    def get_state(self) -> dict:
+        """
+        Returns:
+            state (dict): The state of the engine that must be checkpointed
+                for a run to resume exactly, nothing for this engine as each
+                share of the ants is seeded from the random module.
+        """
+        return {}
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores the state returned by get_state.
+        """
+
+    def close(self) -> None:
+        """
+        Stops the worker processes and frees the shared memory blocks.
+        """
+        self.pool.terminate()
+        self.pool.join()
+        self.pheromone.release()
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+
+
+def ant_colony_optimisation_algorithm(xml_data: [],
+                                      m: int,
+                                      q: int,
+                                      alpha: float,
+                                      beta: int,
+                                      starting_node: int,
+                                      evaporation_rate: float,
+                                      workers: int = None,
+                                      **options
+                                      ) -> (float, [int], float):
+    """
+    A version of the ant colony optimisation algorithm where the ants of each
+    iteration are split between a pool of worker processes. The rest of the
+    algorithm is shared with tsp_aco_algorithm, so the elitist and MMAS
+    variants are run by passing their policy.
+
+    Args:
+        xml_data (str | TSPInstance | []): The dataset used to find the nodes
+            in the graph and the connections between them. Either the path to
+            the dataset, an instance already loaded by load_instance or the
+            raw XML data extracted by BeautifulSoup.
+        m (int): The colony size, this is the number of ants that traverse
+            the graph in each iteration.
+        q (int): A fixed local heuristic value for to reward paths
+            proportionally to their fitness value.
+        alpha (float): A pheromone importance factor that decreases/ increases
+            the weight pheromone has on an edge's desirability.
+        beta (int): A heuristic importance factor that decreases/ increases
+            the weight an edge's distance has on its desirabiility.
+        starting_node (int): The index representing the node the each ant will
+            start its path from.
+        evaporation_rate (float): The rate at which pheromone is evaporated
+            from the pheromone matrix after each iteration.
+        workers (int): The number of worker processes the ants are split
+            between, None uses every core.
+        **options: Any of the keyword arguments accepted by
+            tsp_aco_algorithm.ant_colony_optimisation_algorithm, such as
+            policy or candidate_lists.
+
+    Returns:
+        (best_fitness,
+        best_path,
+        average_solution_tracker) (float, [int], [float]): Returns a tuple
+            storing the best fitness found, its accompanying path and the
+            average solution length found at each iteration (only used for
+            matplotlib).
+    """
+    return tsp_aco_algorithm.ant_colony_optimisation_algorithm(
+        xml_data, m, q, alpha, beta, starting_node, evaporation_rate,
+        engine="parallel", workers=workers, **options)
+
+
+if __name__ == "__main__":
+    # Takes the name of the XML file to be used as input
+    FILE_NAME = str(input("What is the full name (incl extension)"
+                          + " of the file to be used:"))
+
+    xml_data = load_instance('../docs/' + FILE_NAME)
+
+    # Executes the ACO with the given parameters and times its execution
+    start_time = time.time()
+    (best_fitness,
+     best_path,
+     average_solution_tracker) = ant_colony_optimisation_algorithm(xml_data,
+                                                                   130,
+                                                                   500,
+                                                                   0.5,
+                                                                   9,
+                                                                   0,
+                                                                   0.3)
+    end_time = time.time()
+
+    print("The best fitness found was:", best_fitness, "\n")
+    print("The best path found was:", print_path(best_path))
+    print("The time taken by this algorithm was:", end_time-start_time, "s")
@@ -0,0 +1,193 @@
+"""Runs parameter sweeps of the ACO algorithms across a pool of processes"""
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from instance_cache import file_hash
+from instance_loader import load_instance
+from run_store import RunStore
+
+# The run store used by the graph programs, so redrawing a graph only runs
+# the points that have not been run before
+DEFAULT_STORE = "../docs/sweep_results.sqlite"
+
+# The instances loaded by this process, so each worker only loads a dataset
+# once no matter how many runs it is given
+loaded_instances = {}
+
+
+def run_seed(seed: int, arguments: tuple, repeat: int) -> str:
+    """
+    Args:
+        seed (int): The seed of the whole sweep.
+        arguments (tuple): The parameter values of the run, or None to give
+            the same repeat of every point the same seed.
+        repeat (int): The index of the repeat at those parameter values.
+
+    Returns:
+        run_seed (str): The seed used by a single run. It only depends on the
+            values above, so a run gives the same result regardless of the
+            number of workers, the order the runs are executed in or the
+            other parameter values in the sweep, which lets stored runs be
+            reused by any sweep.
+    """
+    if arguments is None:
+        return str(seed) + ":" + str(repeat)
+
+    return str(seed) + ":" + repr(tuple(arguments)) + ":" + str(repeat)
+
+
+def run_sweep_task(task: tuple) -> tuple:
+    """
+    Executes a single run of a sweep, in whichever process it is sent to.
+
+    Args:
+        task (tuple): The algorithm function, the path to the dataset, the
+            arguments passed after the dataset, the keyword arguments passed
+            to the algorithm and the seed of the run.
+
+    Returns:
+        result (tuple): The tuple returned by the algorithm.
+    """
+    (algorithm, file_path, arguments, options, seed) = task
+    if file_path not in loaded_instances:
+        loaded_instances[file_path] = load_instance(file_path, cache=True)
+
+    random.seed(seed)
+    return algorithm(loaded_instances[file_path], *arguments, **options)
+
+
+def run_sweep(algorithm,
+              file_path: str,
+              argument_grid: [tuple],
+              repeats: int,
+              workers: int = None,
+              seed: int = 0,
+              store: str = None,
+              options: dict = None,
+              first_repeat: int = 0,
+              paired: bool = False) -> [[tuple]]:
+    """
+    Runs an ACO algorithm repeats times for each set of parameter values in
+    argument_grid. Every run is independent, so the (parameter values,
+    repeat) pairs are shared out between a pool of worker processes and the
+    results are put back in order once they have finished.
+
+    Args:
+        algorithm (function): The algorithm being run, for example
+            tsp_aco_algorithm.ant_colony_optimisation_algorithm. This must be
+            defined at the top level of a module so it can be sent to the
+            worker processes.
+        file_path (str): The path to the dataset, which each worker loads
+            through the compiled instance cache.
+        argument_grid ([tuple]): The arguments passed to the algorithm after
+            the dataset, one tuple for each point in the sweep.
+        repeats (int): The number of times the algorithm is run at each point.
+        workers (int): The number of worker processes, None uses every core
+            and 1 runs every run in this process.
+        seed (int): The seed of the sweep, used to give every run its own
+            reproducible seed.
+        store (str): The path to an SQLite run store (see run_store). Runs
+            already in the store are read from it rather than run again, and
+            every new run is added to it as soon as it finishes. None runs
+            every run.
+        options (dict): Keyword arguments passed to the algorithm in every
+            run, for example the number of fitness evaluations.
+        first_repeat (int): The index of the first repeat run at each point,
+            so a sweep can be extended with more repeats without running the
+            earlier ones again.
+        paired (bool): Whether the same repeat of every point is run with the
+            same seed, so the results of different points can be compared
+            repeat by repeat. Otherwise each run's seed also depends on its
+            parameter values.
+
+    Returns:
+        results ([[tuple]]): For each point in argument_grid, the results of
+            each of its repeats in order.
+    """
+    if options is None:
+        options = {}
+
+    tasks = []
+    for point in range(0, len(argument_grid)):
+        for repeat in range(first_repeat, first_repeat + repeats):
+            arguments = tuple(argument_grid[point])
+            tasks.append((algorithm, file_path, arguments, options,
+                          run_seed(seed, None if paired else arguments,
+                                   repeat)))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    flat_results = [None] * len(tasks)
+    missing = list(range(0, len(tasks)))
+    run_store = None
+    executor = None
+    # Each run seeds the random module, so the caller's random state is
+    # restored once any runs in this process have finished
+    random_state = None
+    try:
+        # Only the runs missing from the store are run
+        if store is not None:
+            run_store = RunStore(store)
+            instance = file_hash(file_path)
+            variant = algorithm.__module__ + "." + algorithm.__qualname__
+            # Runs with different options are stored separately
+            if len(options) > 0:
+                variant += json.dumps(options, sort_keys=True)
+            missing = []
+            for index in range(0, len(tasks)):
+                (_, _, arguments, _, task_seed) = tasks[index]
+                flat_results[index] = run_store.get(instance, variant,
+                                                    arguments, task_seed)
+                if flat_results[index] is None:
+                    missing.append(index)
+
+        missing_tasks = [tasks[index] for index in missing]
+        if workers == 1 or len(missing_tasks) <= 1:
+            random_state = random.getstate()
+            missing_results = map(run_sweep_task, missing_tasks)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            missing_results = executor.map(run_sweep_task, missing_tasks)
+
+        # Each run is stored as soon as it finishes, so an interrupted sweep
+        # keeps the runs it has completed
+        for (index, result) in zip(missing, missing_results):
+            flat_results[index] = result
+            if run_store is not None:
+                (_, _, arguments, _, task_seed) = tasks[index]
+                run_store.put(instance, os.path.basename(file_path), variant,
+                              arguments, task_seed, result)
+    finally:
+        if random_state is not None:
+            random.setstate(random_state)
+        if executor is not None:
+            executor.shutdown()
+        if run_store is not None:
+            run_store.close()
+
+    results = []
+    for point in range(0, len(argument_grid)):
+        results.append(flat_results[point * repeats:(point + 1) * repeats])
+
+    return results
+
+
+def average_best_fitness(results: [[tuple]]) -> [float]:
+    """
+    Args:
+        results ([[tuple]]): The results of a sweep, as returned by run_sweep.
+
+    Returns:
+        averages ([float]): The average best fitness found at each point in
+            the sweep.
+    """
+    averages = []
+    for point_results in results:
+        total = 0
+        for result in point_results:
+            total += result[0]
+        averages.append(total/len(point_results))
+
+    return averages
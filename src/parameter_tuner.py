@@ -0,0 +1,254 @@
+"""Tunes the parameters of the ACO algorithms by racing configurations"""
+import argparse
+import json
+import math
+import random
+import sys
+import elitist_aco_algorithm
+import elitist_mmas_aco_algorithm
+import mmas_aco_algorithm
+import tsp_aco_algorithm
+from parameter_sweep import run_sweep
+
+# The range each parameter is sampled from, and how: "int" and "float" are
+# sampled uniformly, "log" log-uniformly, for parameters whose useful values
+# span several orders of magnitude
+PARAMETER_SPACE = {
+    "m": (10, 150, "int"),
+    "q": (1, 1000, "log"),
+    "alpha": (0.1, 3.0, "float"),
+    "beta": (1, 12, "int"),
+    "elite_proportion": (0.05, 0.5, "float"),
+    "evaporation_rate": (0.05, 0.95, "float"),
+    "upper_bound": (2, 50, "int"),
+    "lower_bound": (0.001, 1.0, "log"),
+}
+
+# Every variant with its algorithm and the parameters it takes after the
+# dataset, in order. The starting node is not tuned, as it does not change
+# how good the paths are
+VARIANTS = {
+    "aco": (tsp_aco_algorithm.ant_colony_optimisation_algorithm,
+            ("m", "q", "alpha", "beta", "starting_node",
+             "evaporation_rate")),
+    "elitist": (elitist_aco_algorithm.ant_colony_optimisation_algorithm,
+                ("m", "q", "alpha", "beta", "starting_node",
+                 "elite_proportion", "evaporation_rate")),
+    "mmas": (mmas_aco_algorithm.ant_colony_optimisation_algorithm,
+             ("m", "q", "alpha", "beta", "starting_node", "evaporation_rate",
+              "upper_bound", "lower_bound")),
+    "elitist_mmas": (
+        elitist_mmas_aco_algorithm.ant_colony_optimisation_algorithm,
+        ("m", "q", "alpha", "beta", "starting_node", "elite_proportion",
+         "evaporation_rate", "upper_bound", "lower_bound")),
+}
+
+# The values used by each module's main execution method, always raced
+# alongside the sampled configurations
+DEFAULT_CONFIGURATION = {"m": 130, "q": 500, "alpha": 0.5, "beta": 9,
+                         "starting_node": 0, "elite_proportion": 0.2,
+                         "evaporation_rate": 0.3, "upper_bound": 10,
+                         "lower_bound": 1}
+
+# The one-sided 95% critical values of Student's t distribution for 1 to 30
+# degrees of freedom, beyond which the normal distribution's value is used
+T_CRITICAL_VALUES = (6.314, 2.920, 2.353, 2.132, 2.015, 1.943, 1.895, 1.860,
+                     1.833, 1.812, 1.796, 1.782, 1.771, 1.761, 1.753, 1.746,
+                     1.740, 1.734, 1.729, 1.725, 1.721, 1.717, 1.714, 1.711,
+                     1.708, 1.706, 1.703, 1.701, 1.699, 1.697)
+
+
+def sample_configuration(variant: str, generator: random.Random) -> dict:
+    """
+    Args:
+        variant (str): The variant being tuned, a key of VARIANTS.
+        generator (random.Random): The generator the values are drawn from,
+            kept separate from the random module used by the runs.
+
+    Returns:
+        configuration (dict): A value for each of the variant's parameters.
+    """
+    configuration = {}
+    for name in VARIANTS[variant][1]:
+        if name not in PARAMETER_SPACE:
+            configuration[name] = DEFAULT_CONFIGURATION[name]
+            continue
+
+        (low, high, kind) = PARAMETER_SPACE[name]
+        if kind == "int":
+            configuration[name] = generator.randint(low, high)
+        elif kind == "log":
+            value = math.exp(generator.uniform(math.log(low), math.log(high)))
+            configuration[name] = round(value, 3)
+        else:
+            configuration[name] = round(generator.uniform(low, high), 3)
+
+    # The lower bound of the pheromone must be below the upper bound
+    if "lower_bound" in configuration:
+        configuration["lower_bound"] = min(configuration["lower_bound"],
+                                           configuration["upper_bound"] / 2)
+
+    return configuration
+
+
+def is_worse(results: [float], best_results: [float]) -> bool:
+    """
+    Tests whether a configuration is worse than the best one, from the
+    difference between their results in each round (a paired t-test). Every
+    run in a round uses the same seed, so each round's results form a pair.
+
+    Args:
+        results ([float]): The best fitness of each of the configuration's
+            runs, at least two.
+        best_results ([float]): The best fitness of each of the best
+            configuration's runs, in the same rounds.
+
+    Returns:
+        worse (bool): Whether the lower end of the one-sided 95% confidence
+            interval of the mean difference is above 0, so the configuration
+            is worse with 95% confidence.
+    """
+    differences = [a - b for (a, b) in zip(results, best_results)]
+    rounds = len(differences)
+    mean = sum(differences) / rounds
+    variance = sum((d - mean) ** 2 for d in differences) / (rounds - 1)
+    if variance == 0:
+        return mean > 0
+
+    if rounds - 1 <= len(T_CRITICAL_VALUES):
+        critical_value = T_CRITICAL_VALUES[rounds - 2]
+    else:
+        critical_value = 1.645
+
+    return mean - critical_value * math.sqrt(variance / rounds) > 0
+
+
+def race(file_path: str,
+         variant: str,
+         budget: int,
+         num_configurations: int = 32,
+         evaluations: int = 2_000,
+         min_rounds: int = 3,
+         max_rounds: int = 30,
+         workers: int = None,
+         seed: int = 0,
+         store: str = None,
+         log=sys.stderr) -> dict:
+    """
+    Tunes every parameter of a variant at once by racing randomly sampled
+    configurations against each other. In each round every configuration
+    still in the race is run once more, then any configuration that is
+    worse than the best one with 95% confidence (see is_worse) is
+    eliminated. Bad configurations are therefore dropped after only a few
+    runs, and the race stops once a single configuration is left, the
+    maximum number of rounds has been run or the budget cannot pay for
+    another round.
+
+    Args:
+        file_path (str): The path to the dataset the configurations are
+            raced on.
+        variant (str): The variant being tuned, a key of VARIANTS.
+        budget (int): The total number of fitness evaluations the race can
+            use.
+        num_configurations (int): The number of configurations raced,
+            including the default configuration.
+        evaluations (int): The number of fitness evaluations used by each
+            run.
+        min_rounds (int): The number of rounds run before any configuration
+            can be eliminated, at least 2 as the test needs two rounds to
+            estimate the variance.
+        max_rounds (int): The largest number of rounds run.
+        workers (int): The number of worker processes running each round,
+            see run_sweep.
+        seed (int): The seed of the race, used both to sample the
+            configurations and to seed each run.
+        store (str): The path to an SQLite run store (see run_store), so runs
+            from earlier races are not run again.
+        log (file): Where the progress of the race is written.
+
+    Returns:
+        result (dict): The best configuration, its mean best fitness, the
+            number of rounds it was run for, the number of configurations
+            left in the race and the fitness evaluations used.
+
+    Raises:
+        ValueError: If min_rounds is less than 2.
+    """
+    if min_rounds < 2:
+        raise ValueError("min_rounds must be at least 2, not "
+                         + str(min_rounds))
+
+    (algorithm, parameters) = VARIANTS[variant]
+    generator = random.Random(seed)
+    configurations = [{name: DEFAULT_CONFIGURATION[name]
+                       for name in parameters}]
+    while len(configurations) < num_configurations:
+        configurations.append(sample_configuration(variant, generator))
+
+    # The best fitness of each configuration's run in each round
+    results = [[] for configuration in configurations]
+    alive = list(range(0, len(configurations)))
+    used = 0
+    rounds = 0
+    while rounds < max_rounds and len(alive) > 1:
+        if used + len(alive) * evaluations > budget:
+            break
+
+        grid = [tuple(configurations[index][name] for name in parameters)
+                for index in alive]
+        round_results = run_sweep(algorithm, file_path, grid, 1, workers,
+                                  seed, store, {"evaluations": evaluations},
+                                  first_repeat=rounds, paired=True)
+        for (index, point_results) in zip(alive, round_results):
+            results[index].append(point_results[0][0])
+        used += len(alive) * evaluations
+        rounds += 1
+
+        best = min(alive, key=lambda index: sum(results[index]))
+        if rounds >= min_rounds:
+            alive = [index for index in alive
+                     if index == best
+                     or not is_worse(results[index], results[best])]
+
+        print("round", rounds, "configurations left:", len(alive),
+              "best mean:", sum(results[best]) / rounds, file=log)
+
+    best = min(alive, key=lambda index: (sum(results[index])
+                                         / max(len(results[index]), 1)))
+
+    return {
+        "variant": variant,
+        "configuration": configurations[best],
+        "mean_best_fitness": (sum(results[best]) / len(results[best])
+                              if len(results[best]) > 0 else None),
+        "rounds": len(results[best]),
+        "configurations_left": len(alive),
+        "evaluations_used": used,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Tunes the parameters of an ACO variant by racing "
+        + "configurations, printing the best as JSON.")
+    parser.add_argument("instance", help="The path to the dataset.")
+    parser.add_argument("--algorithm", default="aco", choices=list(VARIANTS))
+    parser.add_argument("--budget", type=int, default=2_000_000,
+                        help="The total number of fitness evaluations.")
+    parser.add_argument("--configurations", type=int, default=32)
+    parser.add_argument("--evaluations", type=int, default=2_000,
+                        help="The fitness evaluations of each run.")
+    parser.add_argument("--min-rounds", type=int, default=3)
+    parser.add_argument("--max-rounds", type=int, default=30)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--store", help="An SQLite run store, so runs are "
+                        + "never repeated.")
+    args = parser.parse_args()
+    if args.min_rounds < 2:
+        parser.error("--min-rounds must be at least 2")
+
+    result = race(args.instance, args.algorithm, args.budget,
+                  args.configurations, args.evaluations, args.min_rounds,
+                  args.max_rounds, args.workers, args.seed, args.store)
+    print(json.dumps(result, indent=2))
@@ -0,0 +1,211 @@
+"""Stores the pheromone matrix used by the ACO algorithms"""
+import array
+
+# Once the scale factor falls below this value it is folded back into the
+# stored values, long before the values could underflow
+RENORMALISE_BELOW = 1e-100
+
+
+class PheromoneMatrix:
+    """
+    The pheromone matrix, t, stored row by row in a single contiguous array
+    of doubles, so the pheromone on the edge from node i to node j is found at
+    index i * num_nodes + j. Evaporation multiplies every edge by the same
+    value, so rather than touching every edge it only updates a global scale
+    factor, the true pheromone on an edge being its stored value multiplied by
+    this scale. The MMAS lower bound is applied in the same lazy way, when an
+    edge is read or deposited on, which gives the same values as clamping
+    every edge after each evaporation as evaporating an edge already at the
+    lower bound always takes it below the bound again.
+
+    Attributes:
+        num_nodes (int): The number of nodes in the graph.
+        values (array): The stored pheromone of every edge, which must be
+            multiplied by scale to give the true pheromone.
+        scale (float): The product of every evaporation since the stored
+            values were last renormalised.
+        lower_bound (float): The smallest amount of pheromone any edge can
+            have, None until a lower bound is set by an evaporation.
+    """
+
+    def __init__(self, num_nodes: int, values: array.array):
+        self.num_nodes = num_nodes
+        self.values = values
+        self.scale = 1.0
+        self.lower_bound = None
+
+    @classmethod
+    def from_rows(cls, t: [[float]]) -> "PheromoneMatrix":
+        """
+        Args:
+            t ([[float]]): A pheromone matrix stored as a 2D array, as
+                returned by initialisation.
+
+        Returns:
+            matrix (PheromoneMatrix): A pheromone matrix storing the same
+                values.
+        """
+        values = array.array('d')
+        for row in t:
+            values.extend(row)
+
+        return cls(len(t), values)
+
+    def __len__(self) -> int:
+        return self.num_nodes
+
+    def __getitem__(self, i: int) -> (float,):
+        """
+        Args:
+            i (int): The index of the node the edges leave from.
+
+        Returns:
+            row ((float,)): The true pheromone on every edge leaving node i.
+                The row is a copy, so it is a tuple to stop t[i][j] = value
+                appearing to work while changing nothing. Use set instead.
+        """
+        if not 0 <= i < self.num_nodes:
+            raise IndexError("pheromone matrix row out of range")
+
+        start = i * self.num_nodes
+        row = self.values[start:start + self.num_nodes]
+        return tuple(self.true_values(row))
+
+    def __iter__(self):
+        for i in range(0, self.num_nodes):
+            yield self[i]
+
+    def true_values(self, values: array.array = None) -> array.array:
+        """
+        Args:
+            values (array): Some of the stored values, None uses every stored
+                value.
+
+        Returns:
+            values (array): A new array holding the true pheromone of each of
+                the values, with the scale factor and lower bound applied.
+        """
+        if values is None:
+            values = self.values
+        scale = self.scale
+        lower_bound = self.lower_bound
+
+        if lower_bound is None:
+            if scale == 1.0:
+                return array.array('d', values)
+            return array.array('d', [value * scale for value in values])
+
+        return array.array('d', [max(value * scale, lower_bound)
+                                 for value in values])
+
+    def get(self, i: int, j: int) -> float:
+        """
+        Args:
+            i (int): The index of the node the edge leaves from.
+            j (int): The index of the node the edge leads to.
+
+        Returns:
+            pheromone (float): The true pheromone on the edge.
+        """
+        value = self.values[i * self.num_nodes + j] * self.scale
+        if self.lower_bound is not None and value < self.lower_bound:
+            return self.lower_bound
+
+        return value
+
+    def set(self, i: int, j: int, value: float) -> None:
+        """
+        Sets the true pheromone on an edge, which is still raised to the
+        lower bound when it is read.
+
+        Args:
+            i (int): The index of the node the edge leaves from.
+            j (int): The index of the node the edge leads to.
+            value (float): The pheromone on the edge.
+        """
+        self.values[i * self.num_nodes + j] = value / self.scale
+
+    def deposit(self, paths: [[int]], weights: [float],
+                symmetric: bool = False, upper_bound: float = None) -> None:
+        """
+        Deposits pheromone on every edge of every path in an iteration at
+        once. The edges of all of the paths are gathered into one array of
+        indices, alongside the weight of the path each edge belongs to, and
+        are then applied with a single scatter-add.
+
+        Args:
+            paths ([[int]]): The paths whose edges pheromone is deposited on.
+            weights ([float]): The amount of pheromone deposited on each edge
+                of the path at the same index.
+            symmetric (bool): Whether the same amount is also deposited on the
+                reverse of each edge, for symmetric instances.
+            upper_bound (float): The largest amount of pheromone a single path
+                can deposit on an edge (MMAS), None leaves the deposit
+                unbounded.
+        """
+        n = self.num_nodes
+        indices = array.array('q')
+        amounts = array.array('d')
+        for (path, weight) in zip(paths, weights):
+            if upper_bound is not None and weight > upper_bound:
+                weight = upper_bound
+            indices.extend([a * n + b for (a, b) in zip(path, path[1:])])
+            if symmetric:
+                indices.extend([b * n + a for (a, b) in zip(path, path[1:])])
+            amounts.extend([weight] * (len(indices) - len(amounts)))
+
+        self.scatter_add(indices, amounts)
+
+    def scatter_add(self, indices: array.array,
+                    amounts: array.array) -> None:
+        """
+        Adds each amount to the true pheromone at the corresponding index of
+        the flattened matrix, amounts for the same index being summed. Every
+        edge is written once, no matter how many paths used it.
+
+        Args:
+            indices (array): The index of each edge, i * num_nodes + j.
+            amounts (array): The amount of pheromone added to each edge.
+        """
+        totals = {}
+        for (index, amount) in zip(indices, amounts):
+            totals[index] = totals.get(index, 0.0) + amount
+
+        values = self.values
+        scale = self.scale
+        lower_bound = self.lower_bound
+        for (index, total) in totals.items():
+            # The deposit is added to the true value (so an edge below the
+            # lower bound is first raised to it) and then stored without the
+            # scale
+            value = values[index] * scale
+            if lower_bound is not None and value < lower_bound:
+                value = lower_bound
+            values[index] = (value + total) / scale
+
+    def evaporate(self, evaporation_rate: float,
+                  lower_bound: float = None) -> None:
+        """
+        Evaporates the pheromone on every edge in O(1) time by updating the
+        scale factor, only touching every edge when the scale factor needs to
+        be renormalised.
+
+        Args:
+            evaporation_rate (float): The proportion of the pheromone on each
+                edge that is evaporated, between 0 and 1.
+            lower_bound (float): The smallest amount of pheromone any edge can
+                have after evaporating (MMAS), None leaves the pheromone
+                unbounded.
+        """
+        self.scale *= (1-evaporation_rate)
+        self.lower_bound = lower_bound
+        if self.scale < RENORMALISE_BELOW:
+            self.renormalise()
+
+    def renormalise(self) -> None:
+        """
+        Folds the scale factor and lower bound into the stored values, so the
+        stored values are the true pheromone again.
+        """
+        self.values = self.true_values()
+        self.scale = 1.0
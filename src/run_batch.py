@@ -0,0 +1,199 @@
+"""Runs batches of the ACO algorithms from the command line as JSON lines"""
+import argparse
+import json
+import random
+import sys
+import time
+from elitist_aco_algorithm import ElitistPolicy
+from elitist_mmas_aco_algorithm import ElitistMaxMinPolicy
+from instance_loader import load_instance
+from mmas_aco_algorithm import MaxMinPolicy
+from tsp_aco_algorithm import (LOCAL_SEARCH_MODES, AntSystemPolicy,
+                               iterate_colony)
+
+# The variants that can be run
+ALGORITHMS = ("aco", "elitist", "mmas", "elitist_mmas")
+
+
+def create_policy(algorithm: str, elite_proportion: float,
+                  upper_bound: float,
+                  lower_bound: float) -> AntSystemPolicy:
+    """
+    Args:
+        algorithm (str): The variant being run, one of ALGORITHMS.
+        elite_proportion (float): The proportion of ants that deposit
+            pheromone in the elitist variants.
+        upper_bound (float): The largest amount of pheromone a path can deposit
+            on an edge in the MMAS variants.
+        lower_bound (float): The smallest amount of pheromone an edge can have
+            in the MMAS variants.
+
+    Returns:
+        policy (AntSystemPolicy): The pheromone update rules of the variant.
+    """
+    if algorithm == "aco":
+        return AntSystemPolicy()
+    elif algorithm == "elitist":
+        return ElitistPolicy(elite_proportion)
+    elif algorithm == "mmas":
+        return MaxMinPolicy(upper_bound, lower_bound)
+    elif algorithm == "elitist_mmas":
+        return ElitistMaxMinPolicy(elite_proportion, upper_bound, lower_bound)
+
+    raise ValueError("Unknown algorithm: " + str(algorithm))
+
+
+def run_batch(file_paths: [str], algorithm: str, seeds: [int],
+              repeats: int, arguments: tuple, policy_arguments: tuple,
+              options: dict, output=sys.stdout) -> None:
+    """
+    Runs an algorithm repeats times for every seed on every instance, writing
+    the result of each run to the output as a single line of JSON as soon as
+    it finishes. Each instance is loaded once and shared by all of its runs.
+
+    Args:
+        file_paths ([str]): The paths to the datasets.
+        algorithm (str): The variant being run, one of ALGORITHMS.
+        seeds ([int]): The seeds each instance is run with.
+        repeats (int): The number of runs for each seed, the random module
+            being seeded with "seed:repeat" for each.
+        arguments (tuple): The arguments passed to iterate_colony after the
+            dataset (m, q, alpha, beta, starting_node and evaporation_rate).
+        policy_arguments (tuple): The elite proportion, upper bound and
+            lower bound passed to create_policy.
+        options (dict): The keyword arguments passed to iterate_colony.
+        output (file): Where the JSON lines are written.
+    """
+    for file_path in file_paths:
+        instance = load_instance(file_path, cache=True)
+        for seed in seeds:
+            for repeat in range(0, repeats):
+                # Each run has its own policy, so no state is shared
+                policy = create_policy(algorithm, *policy_arguments)
+                random.seed(str(seed) + ":" + str(repeat))
+
+                start_time = time.perf_counter()
+                best_path = []
+                statistics = None
+                for statistics in iterate_colony(instance, *arguments,
+                                                 policy=policy, **options):
+                    if statistics.best_path is not None:
+                        best_path = statistics.best_path
+                run_time = time.perf_counter() - start_time
+
+                record = {
+                    "instance": file_path,
+                    "algorithm": algorithm,
+                    "seed": seed,
+                    "repeat": repeat,
+                    "best_fitness": None,
+                    "best_path": list(best_path),
+                    "time": run_time,
+                    "evaluations": 0,
+                    "iterations": 0,
+                    "stop_reason": "evaluations",
+                }
+                if statistics is not None:
+                    record["best_fitness"] = statistics.best_fitness
+                    record["evaluations"] = statistics.evaluations
+                    record["iterations"] = statistics.iteration
+                    record["stop_reason"] = statistics.stop_reason
+
+                # Each line is flushed so the results of a long batch can be
+                # read while it is still running
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+
+
+def add_algorithm_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds a flag for every parameter of the algorithms to a command line
+    parser, shared by every command line program running the algorithms.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser the flags are added to.
+    """
+    # The defaults are the values used by each module's main execution method
+    parser.add_argument("--ants", type=int, default=130)
+    parser.add_argument("--q", type=float, default=500)
+    parser.add_argument("--alpha", type=float, default=0.5)
+    parser.add_argument("--beta", type=int, default=9)
+    parser.add_argument("--starting-node", type=int, default=0)
+    parser.add_argument("--evaporation-rate", type=float, default=0.3)
+    parser.add_argument("--elite-proportion", type=float, default=0.2)
+    parser.add_argument("--upper-bound", type=float, default=10)
+    parser.add_argument("--lower-bound", type=float, default=1)
+
+    parser.add_argument("--engine", default="python",
+                        choices=["python", "numpy", "parallel"])
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--sampler", default="linear",
+                        choices=["linear", "fenwick"])
+    parser.add_argument("--candidate-lists", action="store_true")
+    parser.add_argument("--candidate-list-size", type=int, default=15)
+    parser.add_argument("--local-search", choices=LOCAL_SEARCH_MODES)
+    parser.add_argument("--evaluations", type=int, default=10_000)
+    parser.add_argument("--time-limit", type=float)
+    parser.add_argument("--target-fitness", type=float)
+    parser.add_argument("--stagnation-limit", type=int)
+
+
+def algorithm_arguments(args: argparse.Namespace) -> (tuple, tuple, dict):
+    """
+    Args:
+        args (argparse.Namespace): The parsed flags added by
+            add_algorithm_arguments.
+
+    Returns:
+        (arguments,
+        policy_arguments,
+        options) (tuple, tuple, dict): The arguments passed to iterate_colony
+            after the dataset, the arguments passed to create_policy after the
+            variant and the keyword arguments passed to iterate_colony.
+    """
+    arguments = (args.ants, args.q, args.alpha, args.beta,
+                 args.starting_node, args.evaporation_rate)
+    policy_arguments = (args.elite_proportion, args.upper_bound,
+                        args.lower_bound)
+    options = {
+        "engine": args.engine,
+        "workers": args.workers,
+        "sampler": args.sampler,
+        "candidate_lists": args.candidate_lists,
+        "candidate_list_size": args.candidate_list_size,
+        "local_search": args.local_search,
+        "evaluations": args.evaluations,
+        "time_limit": args.time_limit,
+        "target_fitness": args.target_fitness,
+        "stagnation_limit": args.stagnation_limit,
+    }
+
+    return (arguments, policy_arguments, options)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Runs the ACO algorithms on one or more datasets, "
+        + "writing one line of JSON per run.")
+    parser.add_argument("instances", nargs="+",
+                        help="The paths to the datasets (XML or TSPLIB).")
+    parser.add_argument("--algorithm", default="aco", choices=ALGORITHMS)
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0])
+    parser.add_argument("--repeats", type=int, default=1,
+                        help="The number of runs for each seed.")
+    parser.add_argument("--output", help="The file the JSON lines are "
+                        + "appended to, they are printed if not given.")
+
+    add_algorithm_arguments(parser)
+    args = parser.parse_args()
+
+    (arguments, policy_arguments, options) = algorithm_arguments(args)
+
+    if args.output:
+        with open(args.output, "a") as file:
+            run_batch(args.instances, args.algorithm, args.seeds,
+                      args.repeats, arguments, policy_arguments, options,
+                      file)
+    else:
+        run_batch(args.instances, args.algorithm, args.seeds, args.repeats,
+                  arguments, policy_arguments, options)
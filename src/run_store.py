@@ -0,0 +1,139 @@
+"""Stores the results of ACO runs on disk, so runs are never repeated"""
+import json
+import sqlite3
+import time
+from tsp_aco_algorithm import ALGORITHM_VERSION
+
+# Changing the table of runs requires a new schema version, so stores
+# created with an older table have it replaced
+SCHEMA_VERSION = 2
+# The table of runs, one row for each combination of instance, variant,
+# parameters, seed and algorithm version. The primary key also indexes runs
+# by instance, variant and parameters. The stop reason is only stored for
+# runs whose algorithm returned it
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    instance TEXT NOT NULL,
+    instance_name TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    parameters TEXT NOT NULL,
+    seed TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    best_fitness REAL NOT NULL,
+    best_path TEXT NOT NULL,
+    convergence TEXT NOT NULL,
+    stop_reason TEXT,
+    created REAL NOT NULL,
+    PRIMARY KEY (instance, variant, parameters, seed, version)
+);
+CREATE INDEX IF NOT EXISTS runs_by_variant ON runs (variant, parameters);
+CREATE INDEX IF NOT EXISTS runs_by_name ON runs (instance_name);
+"""
+
+
+class RunStore:
+    """
+    An SQLite database of the results of previous runs, keyed by the
+    instance, the variant of the algorithm, its parameters, the seed of the
+    run and the version of the algorithms. Each run is seeded, so a run with
+    the same key always gives the same result and can be read from the store
+    rather than run again. Runs stored before a change to the algorithms
+    have an older version, so they are never read.
+
+    Attributes:
+        connection (sqlite3.Connection): The connection to the database.
+        version (int): The version of the algorithms whose runs are read and
+            stored.
+    """
+
+    def __init__(self, path: str, version: int = ALGORITHM_VERSION):
+        self.connection = sqlite3.connect(path)
+        self.version = version
+        # A table created by an older schema is missing columns, so it is
+        # replaced, losing the runs stored in it
+        (schema_version,) = self.connection.execute(
+            "PRAGMA user_version").fetchone()
+        if schema_version != SCHEMA_VERSION:
+            with self.connection:
+                self.connection.execute("DROP TABLE IF EXISTS runs")
+                self.connection.execute("PRAGMA user_version = "
+                                        + str(SCHEMA_VERSION))
+        self.connection.executescript(SCHEMA)
+
+    @staticmethod
+    def parameters_key(arguments: tuple) -> str:
+        """
+        Args:
+            arguments (tuple): The arguments passed to the algorithm after the
+                dataset.
+
+        Returns:
+            key (str): The arguments as JSON, which is the same for equal
+                arguments.
+        """
+        return json.dumps(list(arguments))
+
+    def get(self, instance: str, variant: str, arguments: tuple,
+            seed: str) -> tuple:
+        """
+        Args:
+            instance (str): The hash of the dataset's contents.
+            variant (str): The name of the algorithm function.
+            arguments (tuple): The arguments passed to the algorithm after the
+                dataset.
+            seed (str): The seed of the run.
+
+        Returns:
+            result (tuple): The best fitness, best path and average solution
+                length at each iteration of the run, followed by the reason
+                it stopped if the algorithm returned it, in the same form as
+                returned by the algorithm, or None if the run is not stored.
+        """
+        row = self.connection.execute(
+            "SELECT best_fitness, best_path, convergence, stop_reason "
+            + "FROM runs WHERE instance = ? AND variant = ? "
+            + "AND parameters = ? AND seed = ? AND version = ?",
+            (instance, variant, self.parameters_key(arguments), seed,
+             self.version)).fetchone()
+        if row is None:
+            return None
+
+        result = (row[0], json.loads(row[1]), json.loads(row[2]))
+        if row[3] is not None:
+            result += (row[3],)
+
+        return result
+
+    def put(self, instance: str, instance_name: str, variant: str,
+            arguments: tuple, seed: str, result: tuple) -> None:
+        """
+        Stores the result of a run, replacing any run with the same key.
+
+        Args:
+            instance (str): The hash of the dataset's contents.
+            instance_name (str): The name of the dataset, to make the store
+                easier to query by hand.
+            variant (str): The name of the algorithm function.
+            arguments (tuple): The arguments passed to the algorithm after the
+                dataset.
+            seed (str): The seed of the run.
+            result (tuple): The tuple returned by the algorithm.
+        """
+        (best_fitness, best_path, average_solution_tracker) = result[:3]
+        # Only given by algorithms run with return_reason
+        stop_reason = result[3] if len(result) > 3 else None
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, "
+                + "?, ?, ?)",
+                (instance, instance_name, variant,
+                 self.parameters_key(arguments), seed, self.version,
+                 best_fitness, json.dumps(list(best_path)),
+                 json.dumps(list(average_solution_tracker)), stop_reason,
+                 time.time()))
+
+    def close(self) -> None:
+        """
+        Closes the connection to the database.
+        """
+        self.connection.close()
@@ -1,9 +1,17 @@
 """Solves the TSP using an ACO algorithm"""
+import bisect
+import heapq
+import itertools
 import math
 import random
-import copy
+import os
 import time
-from bs4 import BeautifulSoup
+from checkpoint import Checkpoint, load_checkpoint, save_checkpoint
+from fenwick_sampler import FenwickSampler
+from instrumentation import PATH_COUNTERS, Instrumentation, phase
+from instance_loader import load_instance
+from local_search import improve_path
+from pheromone_matrix import PheromoneMatrix
 
 
 def initialisation(xml_data: []) -> ([[float]], [[float]]):
@@ -13,9 +21,10 @@ def initialisation(xml_data: []) -> ([[float]], [[float]]):
     move through the graph and see the pheromone on a given edge.
 
     Args:
-        xml_data ([]): The raw data extracted from the provided XML datasets,
-            used to find the nodes in the graph and the connections between
-            them. BeautifulSoup extracts this as a list.
+        xml_data (str | TSPInstance | []): The dataset used to find the nodes
+            in the graph and the connections between them. Either the path to
+            the dataset, an instance already loaded by load_instance or the
+            raw XML data extracted by BeautifulSoup.
 
     Returns:
         graph ([[float]]): Returns the initialised distance matrix for the
@@ -25,43 +34,22 @@ def initialisation(xml_data: []) -> ([[float]], [[float]]):
             as a 2D array, where each index stores the pheromone on a given
             edge between two nodes.
     """
-    # Extracts the raw XML data for the node and edge objects
-    nodes = xml_data.find_all('vertex')
-    edges = xml_data.find_all('edge')
+    # Reads the graph from the dataset, unless it has already been loaded
+    instance = load_instance(xml_data)
+    graph = instance.graph()
+    # The accuracy all values are stored to
+    accuracy = instance.precision
 
-    # Extracts the raw XML data for the accuracy all values are stored to
-    accuracy = xml_data.find_all('doublePrecision')
-    accuracy = int(accuracy[0].string)
-
-    # Creates a graph to store the edges between nodes in the graph
-    # Node values start from 0 so a 2D array can be used
-    graph = [0] * len(nodes)
     # A 2D array is used to represent the pheromone matrix
-    t = [0] * len(nodes)
-    # Initially these arrays are filled with 0s as placeholder values
-    for i in range(0, len(nodes)):
-        graph[i] = [0] * len(nodes)
-        t[i] = [0] * len(nodes)
-
-    # Used to track the current edge being looked at
-    index = 0
-    # Adds each edge to the graph
-    for j in range(0, len(nodes)):
-        for k in range(0, len(nodes)):
-            # If the edge is on a leading diagonal, its value is set to 0
-            if j == k:
-                graph[j][k] = 0
-            else:
-                # Extracts the cost of the edge from the XML data
-                cost = edges[index]['cost']
-                cost = float(cost)
-                graph[j][k] = round(cost, accuracy)
-                index += 1
+    # Initially it is filled with 0s as placeholder values
+    t = [0] * instance.num_nodes
+    for i in range(0, instance.num_nodes):
+        t[i] = [0] * instance.num_nodes
 
     # Each index in the pheromone matrix is initialised with a random value
     # between 0 and 1
-    for a in range(0, len(nodes)):
-        for b in range(0, len(nodes)):
+    for a in range(0, instance.num_nodes):
+        for b in range(0, instance.num_nodes):
             # If the index is on the leading diagonal it is set to 0
             if a == b:
                 t[a][b] = 0
@@ -82,13 +70,14 @@ def to_string(matrix: [[float]]) -> None:
         print(matrix[i])
 
 
-def evaporate_pheromone(t: [[float]], evaporation_rate: float) -> [[float]]:
+def evaporate_pheromone(t: PheromoneMatrix,
+                        evaporation_rate: float) -> PheromoneMatrix:
     """
     Evaporates (reduces by some multiple) the pheromone value of every edge
     stored in the pheromone matrix supplied to it.
 
     Args:
-        t ([[float]]): The pheromone matrix being used by the ACO, which
+        t (PheromoneMatrix): The pheromone matrix being used by the ACO, which
             stores a float value for each edge in the graph indicating the
             amount of pheromone on it.
         evaporation_rate: Determines the amount of pheromone that's evaporated
@@ -96,20 +85,18 @@ def evaporate_pheromone(t: [[float]], evaporation_rate: float) -> [[float]]:
             1 (in order for the amount of pheromone to decrease).
 
     Returns:
-        t ([[float]]): Returns the updated pheromone matrix once all the
+        t (PheromoneMatrix): Returns the updated pheromone matrix once all the
             values stored in it have been evaporated.
     """
-    # Loop through every index in the pheromone matrix and multiply its value
-    # By the evaporation rate
-    for i in range(0, len(t[0])):
-        for j in range(0, len(t[0])):
-            t[i][j] = (1-evaporation_rate) * t[i][j]
+    # Every edge is multiplied by the same value, so the matrix only has to
+    # update its scale factor rather than every index
+    t.evaporate(evaporation_rate)
 
     return t
 
 
-def update_pheromone(graph: [[float]], paths: [[int]], t: [[float]],
-                     q: int) -> [[float]]:
+def update_pheromone(graph: [[float]], paths: [[int]], t: PheromoneMatrix,
+                     q: int, symmetric: bool = False) -> PheromoneMatrix:
     """
     Updates the pheromone value for each edge in the pheromone matrix that was
     used in the path taken by an ant, the update value is proportional to
@@ -123,25 +110,26 @@ def update_pheromone(graph: [[float]], paths: [[int]], t: [[float]],
         paths ([[int]]): A 2D array storing the paths taken by each ant in the
             colony during the last iteration. Storing them this way allows for
             each path to be easily accessed and manipulated.
-        t ([[float]]): The pheromone matrix being used by the ACO, which
+        t (PheromoneMatrix): The pheromone matrix being used by the ACO, which
             stores a float value for each edge in the graph indicating the
             amount of pheromone on it.
         q (int): A fixed local heuristic value for to reward paths
             proportionally to their fitness value. An integer for ease of use.
+        symmetric (bool): Whether pheromone is also deposited on the reverse
+            of each edge, for symmetric instances.
 
     Returns:
-        t ([[float]]): Returns the updated pheromone matrix once all edges
-            which were used in the prior iteration had their value updated.
+        t (PheromoneMatrix): Returns the updated pheromone matrix once all
+            edges which were used in the prior iteration had their value
+            updated.
 
     """
+    # The amount each path deposits on its edges is proportional to its
+    # fitness, which tours already carry
+    weights = [q/tour_length(graph, path) for path in paths]
 
-    # For every path taken by the ants
-    for i in range(0, len(paths)):
-        # Find its fitness and update every corresponding edge in the
-        # Pheromone matrix by a proportional value
-        fitness = path_length(graph, paths[i])
-        for j in range(1, len(paths[i])):
-            t[paths[i][j-1]][paths[i][j]] += q/fitness
+    # Every edge of every path is updated in a single scatter-add
+    t.deposit(paths, weights, symmetric)
 
     return t
 
@@ -169,6 +157,256 @@ def path_length(graph: [[float]], path: [int]) -> float:
     return fitness
 
 
+class Tour(list):
+    """
+    The path taken by an ant, which carries its length with it so the length
+    is only calculated once, while the ant builds the path, rather than every
+    time the path is evaluated, selected or used to deposit pheromone. A Tour
+    is a list of node indices, so it can be used anywhere a path can.
+
+    Attributes:
+        length (float): The length of the path.
+    """
+
+    def __init__(self, nodes: [int] = (), length: float = 0):
+        super().__init__(nodes)
+        self.length = length
+
+
+def tour_length(graph: [[float]], path: [int]) -> float:
+    """
+    Args:
+        graph ([[float]]): A 2D array representing the graph the ants are
+            traversing.
+        path ([int]): The path taken by an ant, either a Tour or a list of
+            node indices.
+
+    Returns:
+        fitness (float): The length carried by the path if it is a Tour,
+            otherwise the length calculated by path_length.
+    """
+    if isinstance(path, Tour):
+        return path.length
+
+    return path_length(graph, path)
+
+
+def verify_tour_lengths(graph: [[float]], paths: [[int]]) -> None:
+    """
+    Checks the length carried by each tour against the length calculated by
+    path_length, used to test the engines that build the tours.
+
+    Args:
+        graph ([[float]]): A 2D array representing the graph the ants are
+            traversing.
+        paths ([Tour]): The tours being checked.
+
+    Raises:
+        AssertionError: If a tour's length does not match its path.
+    """
+    for path in paths:
+        expected = path_length(graph, path)
+        if not math.isclose(path.length, expected, rel_tol=1e-9):
+            raise AssertionError("Tour length " + str(path.length)
+                                 + " does not match path_length "
+                                 + str(expected) + " for " + str(path))
+
+
+def choice_information(t: PheromoneMatrix, heuristic_matrix: [[float]],
+                       alpha: float) -> [[float]]:
+    """
+    Calculates the desirability of every edge in the graph, t**alpha * H**beta,
+    so it can be shared by every ant in an iteration rather than being
+    recalculated at each step of each ant's path.
+
+    Args:
+        t (PheromoneMatrix): The pheromone matrix being used by the ACO, which
+            stores a float value for each edge in the graph indicating the
+            amount of pheromone on it.
+        heuristic_matrix ([[float]]): The heuristic matrix with every value
+            already raised to the power of beta, as it does not change
+            between iterations.
+        alpha (float): A pheromone importance factor that decreases/ increases
+            the weight pheromone has on an edge's desirability.
+
+    Returns:
+        choice_info ([[float]]): A 2D array where each index stores the
+            desirability of moving along the corresponding edge.
+    """
+    num_nodes = len(t)
+    choice_info = [0] * num_nodes
+    for i in range(0, num_nodes):
+        # Each row of true pheromone values is only read from the matrix once
+        pheromone_row = t[i]
+        heuristic_row = heuristic_matrix[i]
+        choice_info[i] = [(pheromone_row[j]**alpha) * heuristic_row[j]
+                          for j in range(0, num_nodes)]
+
+    return choice_info
+
+
+def nearest_neighbour_lists(graph: [[float]], k: int) -> [[int]]:
+    """
+    Builds a candidate list for every node in the graph, containing the k
+    nodes closest to it. Restricting the choice of the next node to these
+    candidates means ants do not have to score every remaining node at every
+    step, which makes large graphs practical.
+
+    Args:
+        graph ([[float]]): A 2D array representing the graph the ants are
+            traversing, as returned by initialisation.
+        k (int): The number of candidates stored for each node. Values larger
+            than the number of other nodes store every other node.
+
+    Returns:
+        candidates ([[int]]): A 2D array where each index stores the k nearest
+            nodes to that node, in ascending order of distance.
+    """
+    candidates = [0] * len(graph[0])
+    for i in range(0, len(graph[0])):
+        distances = graph[i]
+        others = [j for j in range(0, len(graph[0])) if j != i]
+        candidates[i] = heapq.nsmallest(k, others,
+                                        key=lambda j: distances[j])
+
+    return candidates
+
+
+def construct_path(choice_info: [[float]], starting_node: int,
+                   candidates: [[int]] = None,
+                   graph: [[float]] = None,
+                   sampler: FenwickSampler = None,
+                   counters: {str: int} = None) -> [int]:
+    """
+    Builds the path taken by a single ant through the graph. At each step the
+    next node is chosen from the nodes the ant has yet to visit, with a
+    probability proportional to the desirability of the edge leading to it.
+    If candidate lists are provided only the unvisited candidates of the
+    current node are considered, falling back to every unvisited node once
+    all of the candidates have been visited.
+
+    Args:
+        choice_info ([[float]]): The desirability of every edge in the graph
+            for the current iteration, shared by every ant.
+        starting_node (int): The index of the node the ant starts (and
+            finishes) its path at.
+        candidates ([[int]]): The candidate list for each node, as built by
+            nearest_neighbour_lists. None considers every unvisited node.
+        graph ([[float]]): A 2D array representing the graph the ants are
+            traversing. If provided, the length of the path is added up as
+            it is built and the path is returned as a Tour.
+        sampler (FenwickSampler): Used to draw the next node by rejection
+            sampling from a Fenwick tree of the current node's edges in
+            O(log n) time per draw, falling back to the linear roulette wheel
+            below late in the path when most draws hit visited nodes. None
+            uses the linear roulette wheel for every step.
+        counters ({str: int}): If provided, the number of times each event
+            in instrumentation.PATH_COUNTERS occurs is added to it, this must
+            already hold a count for each of these events.
+
+    Returns:
+        path ([int]): The path taken by the ant, starting and ending at the
+            starting node.
+    """
+    # The nodes which must still be visited by this ant. As this is tracked
+    # per ant, the shared choice info matrix never has to be copied or
+    # modified
+    nodes = []
+    for c in range(0, len(choice_info[0])):
+        if c != starting_node:
+            nodes.append(c)
+    # The index of each unvisited node in nodes, so a visited node can be
+    # removed in constant time by swapping it with the last node
+    position = [0] * len(choice_info[0])
+    for p in range(0, len(nodes)):
+        position[nodes[p]] = p
+
+    # Allows the candidates of a node to be checked against the nodes that
+    # have already been visited in constant time
+    visited = bytearray(len(choice_info[0]))
+    visited[starting_node] = 1
+
+    current_node = starting_node
+    path = [current_node]
+    if graph is not None:
+        path = Tour(path)
+
+    # Traverses until there are no more nodes to visit
+    while len(nodes) > 0:
+        desirability = choice_info[current_node]
+
+        # The nodes that can be moved to next, either the unvisited nodes in
+        # the current node's candidate list or every unvisited node
+        considered = nodes
+        if candidates is not None:
+            considered = [c for c in candidates[current_node]
+                          if not visited[c]]
+            if len(considered) == 0:
+                considered = nodes
+            if counters is not None:
+                counters["candidate_scans"] += 1
+                if considered is nodes:
+                    counters["candidate_fallbacks"] += 1
+
+        # The sampler can only choose from every unvisited node, and falls
+        # back to the roulette wheel below if it fails to find one
+        next_node = None
+        if sampler is not None and considered is nodes:
+            next_node = sampler.sample(current_node, visited)
+            if counters is not None:
+                if next_node is None:
+                    counters["fenwick_fallbacks"] += 1
+                else:
+                    counters["fenwick_draws"] += 1
+
+        if next_node is None:
+            # The cumulative desirability of the edges leading to the
+            # considered nodes, the last value being the sum of their
+            # desirabilities
+            cumulative = list(itertools.accumulate(
+                [desirability[c] for c in considered]))
+            sum = cumulative[-1]
+
+            # If the sum is 0, randomly choose one of the considered nodes
+            if sum == 0:
+                next_node = random.choice(considered)
+                if counters is not None:
+                    counters["random_fallbacks"] += 1
+            else:
+                # The first node whose cumulative desirability exceeds a
+                # random fraction of the sum is found with a binary search,
+                # nodes with no desirability can never be chosen as they do
+                # not increase the cumulative total
+                index = bisect.bisect_right(cumulative,
+                                            random.random() * sum)
+                # If rounding leaves the random value at the sum, the last
+                # node with any desirability is used
+                if index == len(cumulative):
+                    index = bisect.bisect_left(cumulative, sum)
+                next_node = considered[index]
+                if counters is not None:
+                    counters["roulette_draws"] += 1
+        current_node = next_node
+
+        # Add the next node to visit to the path taken and remove it from the
+        # unvisited nodes, by moving the last unvisited node into its place
+        if graph is not None:
+            path.length += graph[path[-1]][current_node]
+        path.append(current_node)
+        visited[current_node] = 1
+        last_node = nodes.pop()
+        if last_node != current_node:
+            nodes[position[current_node]] = last_node
+            position[last_node] = position[current_node]
+
+    # The ant must return to the starting node to complete the path
+    if graph is not None:
+        path.length += graph[current_node][starting_node]
+    path.append(starting_node)
+
+    return path
+
+
 def print_path(path: [int]) -> str:
     """
     Creates a formatted string for the path taken by the ant and returns it.
@@ -197,31 +435,597 @@ def print_path(path: [int]) -> str:
     return return_string
 
 
+def heuristic_information(graph: [[float]], accuracy: int,
+                          beta: int) -> [[float]]:
+    """
+    Initialises the heuristic matrix, where each edge is given the value
+    1/ edge length, raised to the power of beta. The heuristic matrix never
+    changes, so it is raised to the power of beta once rather than every time
+    an edge's desirability is calculated.
+
+    Args:
+        graph ([[float]]): A 2D array representing the graph the ants are
+            traversing.
+        accuracy (int): The number of decimal places each value is rounded
+            to, as given by the dataset.
+        beta (int): A heuristic importance factor that decreases/ increases
+            the weight an edge's distance has on its desirabiility.
+
+    Returns:
+        heuristic_matrix ([[float]]): The heuristic matrix, with every value
+            raised to the power of beta.
+    """
+    # Each index in the graph stores num_nodes edges, so it can be used to
+    # size the heuristic matrix
+    heuristic_matrix = [0] * len(graph[0])
+    # Initialised so that every index holds a placeholder value of 0
+    for i in range(0, len(graph[0])):
+        heuristic_matrix[i] = [0] * len(graph[0])
+
+    # Loop through each element in the heuristic matrix
+    for j in range(0, len(heuristic_matrix[0])):
+        for k in range(0, len(heuristic_matrix[0])):
+            # If the index is on the leading diagonal it remains 0
+            if j != k:
+                # Otherwise the index = 1/ edge length
+                heuristic_matrix[j][k] = round((1/graph[j][k]), accuracy)
+
+    for row in heuristic_matrix:
+        for k in range(0, len(row)):
+            row[k] = row[k]**beta
+
+    return heuristic_matrix
+
+
+class AntSystemPolicy:
+    """
+    The pheromone update rules of the standard ant system, where every ant
+    deposits pheromone proportional to the fitness of its path and every edge
+    is then evaporated. The other variants of the algorithm (elitist, MMAS
+    and elitist MMAS) extend this class, overriding the rules they change, so
+    they all share the same construction and iteration code.
+    """
+
+    def select(self, graph: [[float]], paths: [[int]]) -> [[int]]:
+        """
+        Args:
+            graph ([[float]]): A 2D array representing the graph the ants are
+                traversing.
+            paths ([[int]]): The paths taken by each ant in this iteration.
+
+        Returns:
+            paths ([[int]]): The paths which deposit pheromone, every path in
+                the ant system.
+        """
+        return paths
+
+    def update_pheromone(self, graph: [[float]], paths: [[int]],
+                         t: PheromoneMatrix, q: int) -> PheromoneMatrix:
+        """
+        Deposits pheromone on the edges of each selected path, see
+        update_pheromone.
+        """
+        return update_pheromone(graph, paths, t, q)
+
+    def evaporate_pheromone(self, t: PheromoneMatrix,
+                            evaporation_rate: float) -> PheromoneMatrix:
+        """
+        Evaporates the pheromone on every edge, see evaporate_pheromone.
+        """
+        return evaporate_pheromone(t, evaporation_rate)
+
+
+class PathConstructor:
+    """
+    Builds the paths taken by the ants in each iteration, one ant at a time,
+    using construct_path. Each path is returned as a Tour carrying its length.
+    The other engines (numpy_aco_algorithm and parallel_colony) provide the
+    same methods, so any of them can be used by
+    ant_colony_optimisation_algorithm.
+    """
+
+    def __init__(self, graph: [[float]], heuristic_matrix: [[float]],
+                 alpha: float, starting_node: int, candidates: [[int]],
+                 sampler: str = "linear"):
+        self.graph = graph
+        self.heuristic_matrix = heuristic_matrix
+        self.alpha = alpha
+        self.starting_node = starting_node
+        self.candidates = candidates
+        self.sampler = sampler
+
+    def construct(self, t: PheromoneMatrix, num_ants: int,
+                  instrumentation: Instrumentation = None) -> [Tour]:
+        """
+        Args:
+            t (PheromoneMatrix): The pheromone matrix for this iteration.
+            num_ants (int): The number of ants whose paths are built.
+            instrumentation (Instrumentation): Times the choice_info and
+                construction phases and counts the events in building the
+                paths, None if instrumentation is turned off.
+
+        Returns:
+            paths ([Tour]): The path taken by each ant, with its length.
+        """
+        # The desirability of every edge only changes when the pheromone
+        # matrix does, so it is calculated once per iteration and shared by
+        # every ant
+        with phase(instrumentation, "choice_info"):
+            choice_info = choice_information(t, self.heuristic_matrix,
+                                             self.alpha)
+
+        # The sampler's trees are built from this iteration's choice info,
+        # so a new sampler is shared by the ants of each iteration
+        sampler = None
+        if self.sampler == "fenwick":
+            sampler = FenwickSampler(choice_info)
+
+        counters = None
+        if instrumentation is not None:
+            counters = dict.fromkeys(PATH_COUNTERS, 0)
+
+        paths = [0] * num_ants
+        with phase(instrumentation, "construction"):
+            for ant in range(0, num_ants):
+                paths[ant] = construct_path(choice_info, self.starting_node,
+                                            self.candidates, self.graph,
+                                            sampler, counters)
+
+        if instrumentation is not None:
+            instrumentation.count(counters)
+
+        return paths
+
+    def get_state(self) -> dict:
+        """
+        Returns:
+            state (dict): The state of the engine that must be checkpointed
+                for a run to resume exactly, nothing for this engine as it
+                only uses the random module.
+        """
+        return {}
+
+    def set_state(self, state: dict) -> None:
+        """
+        Restores the state returned by get_state.
+        """
+
+    def close(self) -> None:
+        """
+        Releases any resources held by the engine, nothing for this engine.
+        """
+
+
+def create_path_constructor(engine: str, graph: [[float]],
+                            heuristic_matrix: [[float]], alpha: float,
+                            starting_node: int, candidates: [[int]],
+                            workers: int, sampler: str = "linear"):
+    """
+    Creates the engine used to build the paths taken by the ants. The other
+    engines are imported only when requested, so NumPy is not required to
+    run the Python engine.
+
+    Args:
+        engine (str): Either "python", "numpy" or "parallel".
+        graph ([[float]]): A 2D array representing the graph the ants are
+            traversing.
+        heuristic_matrix ([[float]]): The heuristic matrix, raised to the
+            power of beta.
+        alpha (float): The pheromone importance factor.
+        starting_node (int): The index of the node every ant starts from.
+        candidates ([[int]]): The candidate list of each node, or None.
+        workers (int): The number of worker processes used by the parallel
+            engine.
+        sampler (str): How the next node is chosen by the python and
+            parallel engines, either "linear" or "fenwick".
+
+    Returns:
+        constructor (PathConstructor): The engine, providing construct,
+            get_state, set_state and close methods.
+    """
+    if sampler not in ("linear", "fenwick"):
+        raise ValueError("Unknown sampler: " + str(sampler))
+
+    if engine == "python":
+        return PathConstructor(graph, heuristic_matrix, alpha, starting_node,
+                               candidates, sampler)
+    elif engine == "numpy":
+        # The NumPy engine scores every node of every ant at once, so it
+        # has no use for a sampler
+        if sampler != "linear":
+            raise ValueError("The NumPy engine only supports the linear "
+                             + "sampler")
+        import numpy_aco_algorithm
+        return numpy_aco_algorithm.NumpyPathConstructor(
+            graph, heuristic_matrix, alpha, starting_node, candidates)
+    elif engine == "parallel":
+        import parallel_colony
+        return parallel_colony.ParallelPathConstructor(
+            graph, heuristic_matrix, alpha, starting_node, candidates,
+            workers, sampler)
+
+    raise ValueError("Unknown engine: " + str(engine))
+
+
+# Which of each iteration's paths local search is applied to: every path,
+# only the iteration's shortest path, or only the paths the policy selects to
+# deposit pheromone (the elite ants of the elitist variants)
+LOCAL_SEARCH_MODES = ("all", "iteration_best", "elite")
+
+
+def apply_local_search(graph: [[float]], paths: [Tour], mode: str,
+                       neighbours: [[int]], policy: AntSystemPolicy,
+                       counters: {str: int} = None) -> [Tour]:
+    """
+    Improves some of an iteration's paths with 2-opt and Or-opt local search
+    (see local_search), before they are evaluated and used to update the
+    pheromone matrix.
+
+    Args:
+        graph ([[float]]): A 2D array representing the graph the ants are
+            traversing.
+        paths ([Tour]): The paths built by the ants in this iteration.
+        mode (str): Which paths are improved, one of LOCAL_SEARCH_MODES.
+        neighbours ([[int]]): The nearest neighbours of each node, the only
+            nodes moves can join a node to.
+        policy (AntSystemPolicy): The policy of the variant being run, which
+            chooses the elite paths.
+        counters ({str: int}): If provided, the number of moves of each kind
+            made is added to it.
+
+    Returns:
+        paths ([Tour]): The paths, in the same order, with the chosen ones
+            replaced by their improved tours.
+    """
+    if mode == "all":
+        chosen = paths
+    elif mode == "iteration_best":
+        chosen = [min(paths, key=lambda path: path.length)]
+    else:
+        chosen = policy.select(graph, paths)
+
+    # Paths are matched by identity, as two ants can take the same path
+    chosen = {id(path) for path in chosen}
+    improved = []
+    for path in paths:
+        if id(path) in chosen:
+            (path, length) = improve_path(path, graph, neighbours, counters)
+            path = Tour(path, length)
+        improved.append(path)
+
+    return improved
+
+
+# The reasons a run can stop: its fitness evaluations ran out, its time
+# limit passed, it found a path at least as short as its target fitness, or
+# the best fitness stopped improving
+STOP_REASONS = ("evaluations", "time_limit", "target_fitness", "stagnation")
+# Increased whenever a change to the algorithms changes the result of a
+# seeded run, so runs stored by earlier versions (see run_store) are not
+# reused
+ALGORITHM_VERSION = 1
+
+
+class IterationStatistics:
+    """
+    The statistics of a single iteration of the algorithm, as yielded by
+    iterate_colony.
+
+    Attributes:
+        iteration (int): The number of iterations completed, starting from 1.
+        evaluations (int): The number of fitness evaluations performed so
+            far, including this iteration's.
+        num_ants (int): The number of ants used in this iteration, which is
+            only less than m in the final iteration.
+        best_fitness (float): The best fitness found so far.
+        mean_length (float): The average length of this iteration's paths.
+        best_path (Tour): The path which improved the best fitness in this
+            iteration, None if the best fitness did not improve.
+        stop_reason (str): Why the run stopped after this iteration, one of
+            the values in STOP_REASONS, or None if the run continues.
+    """
+
+    def __init__(self, iteration: int, evaluations: int, num_ants: int,
+                 best_fitness: float, mean_length: float, best_path: [int],
+                 stop_reason: str = None):
+        self.iteration = iteration
+        self.evaluations = evaluations
+        self.num_ants = num_ants
+        self.best_fitness = best_fitness
+        self.mean_length = mean_length
+        self.best_path = best_path
+        self.stop_reason = stop_reason
+
+
+def iterate_colony(xml_data: [],
+                   m: int,
+                   q: int,
+                   alpha: float,
+                   beta: int,
+                   starting_node: int,
+                   evaporation_rate: float,
+                   policy: AntSystemPolicy = None,
+                   engine: str = "python",
+                   candidate_lists: bool = False,
+                   candidate_list_size: int = 15,
+                   workers: int = None,
+                   sampler: str = "linear",
+                   evaluations: int = 10_000,
+                   time_limit: float = None,
+                   target_fitness: float = None,
+                   stagnation_limit: int = None,
+                   local_search: str = None,
+                   local_search_neighbours: int = 10,
+                   checkpoint: str = None,
+                   checkpoint_iterations: int = None,
+                   checkpoint_seconds: float = None,
+                   resume: bool = False,
+                   verify_lengths: bool = False,
+                   instrumentation: Instrumentation = None,
+                   resume_from: Checkpoint = None):
+    """
+    Runs the ant colony optimisation algorithm one iteration at a time,
+    yielding the statistics of each iteration as soon as it has finished
+    rather than returning once every fitness evaluation has been performed.
+    Nothing is kept between iterations other than the state of the colony,
+    so callers can stop early (by breaking out of the loop or closing the
+    generator), stream progress to a file or plot, or interleave several
+    runs without holding the full history in memory.
+
+    Args:
+        The same as ant_colony_optimisation_algorithm, other than
+        return_reason. The reason the run stopped is given by the stop_reason
+        of the final iteration's statistics.
+        resume_from (Checkpoint): A checkpoint already loaded by
+            load_checkpoint to continue the run from, used instead of
+            reading the checkpoint file when resume is set.
+
+    Yields:
+        statistics (IterationStatistics): The statistics of each iteration.
+
+    Receives:
+        migrants ([Tour]): Paths found by other colonies, passed in with the
+            generator's send method (see island_model). They deposit
+            pheromone with the policy's update rule before the next
+            iteration, and a migrant shorter than the best fitness becomes
+            the best path, reported as the next iteration's improvement.
+    """
+    if policy is None:
+        policy = AntSystemPolicy()
+    if local_search is not None and local_search not in LOCAL_SEARCH_MODES:
+        raise ValueError("Unknown local search mode: " + str(local_search))
+    if (resume_from is None and resume and checkpoint is not None
+            and os.path.exists(checkpoint)):
+        resume_from = load_checkpoint(checkpoint)
+
+    # The time limit includes the time taken to initialise the colony
+    start_time = time.perf_counter()
+    # The best fitness found thus far, and its path
+    best_fitness = math.inf
+    best_path = []
+    # The number of iterations in a row that have not improved it
+    stagnant_iterations = 0
+    # The average length of every full iteration, only kept to be stored in
+    # checkpoints
+    history = []
+
+    with phase(instrumentation, "initialisation"):
+        # Initialise the graph and pheromone matrix
+        # The dataset is loaded once, so it is only parsed once per run
+        instance = load_instance(xml_data)
+        (graph, t) = initialisation(instance)
+        # The pheromone matrix is stored in a single array, so it can be
+        # evaporated without touching every edge
+        t = PheromoneMatrix.from_rows(t)
+        heuristic_matrix = heuristic_information(graph, instance.precision,
+                                                 beta)
+
+        # Candidate lists of each node's nearest neighbours restrict the
+        # nodes that are scored at each step of an ant's path
+        candidates = None
+        if candidate_lists:
+            candidates = nearest_neighbour_lists(graph, candidate_list_size)
+        # Local search only tries moves between nearest neighbours
+        neighbours = None
+        if local_search is not None:
+            neighbours = nearest_neighbour_lists(graph,
+                                                 local_search_neighbours)
+
+        constructor = create_path_constructor(engine, graph,
+                                              heuristic_matrix, alpha,
+                                              starting_node, candidates,
+                                              workers, sampler)
+    try:
+        # The number of iterations completed
+        iteration = 0
+        # Stop executing the algorithm after the given number of fitness
+        # evaluations
+        fitness_evaluations = 0
+
+        # A resumed run is initialised as normal, then everything that has
+        # changed since is restored, including the random state the
+        # initialisation used
+        if resume_from is not None:
+            if resume_from.t.num_nodes != len(graph):
+                raise ValueError("The checkpoint is for a graph of "
+                                 + str(resume_from.t.num_nodes)
+                                 + " nodes, not " + str(len(graph)))
+            t = resume_from.t
+            iteration = resume_from.iteration
+            fitness_evaluations = resume_from.fitness_evaluations
+            stagnant_iterations = resume_from.stagnant_iterations
+            best_fitness = resume_from.best_fitness
+            best_path = resume_from.best_path
+            history = resume_from.history
+            random.setstate(resume_from.random_state)
+            constructor.set_state(resume_from.engine_state)
+        # When the last checkpoint was written
+        checkpoint_iteration = iteration
+        checkpoint_time = time.perf_counter()
+        # A migrant that improved the best fitness, reported by the next
+        # iteration
+        migrant_path = None
+
+        while fitness_evaluations < evaluations:
+            # Only as many ants as are needed to reach exactly this many
+            # fitness evaluations are used
+            num_ants = min(m, evaluations - fitness_evaluations)
+
+            # Finds a path through the graph with each ant, each path
+            # carrying the length it was found to have as it was built
+            paths = constructor.construct(t, num_ants, instrumentation)
+            # The improved tours replace the ants' paths, so they are used
+            # both for the best fitness and to update the pheromone matrix
+            if local_search is not None:
+                with phase(instrumentation, "local_search"):
+                    counters = None if instrumentation is None else {}
+                    paths = apply_local_search(graph, paths, local_search,
+                                               neighbours, policy, counters)
+                if counters:
+                    instrumentation.count(counters)
+            if verify_lengths:
+                verify_tour_lengths(graph, paths)
+
+            # Check if each ant's path is better than the global best
+            # If it is, update the best fitness value and best path taken
+            with phase(instrumentation, "evaluation"):
+                average_length = 0
+                improved_path = migrant_path
+                migrant_path = None
+                for path in paths:
+                    average_length += path.length
+                    if path.length < best_fitness:
+                        best_fitness = path.length
+                        improved_path = path
+
+            # As the fitness of each solution has been evaluated, increment
+            fitness_evaluations += num_ants
+            if instrumentation is not None:
+                instrumentation.count({"evaluations": num_ants})
+
+            # Once all the paths have been found for this iteration, update
+            # the pheromone values using the paths chosen by the policy
+            with phase(instrumentation, "selection"):
+                selected = policy.select(graph, paths)
+            with phase(instrumentation, "update"):
+                t = policy.update_pheromone(graph, selected, t, q)
+
+            # Once the pheromone matrix has been updated, evaporate the
+            # pheromone values
+            with phase(instrumentation, "evaporation"):
+                t = policy.evaporate_pheromone(t, evaporation_rate)
+
+            iteration += 1
+
+            if improved_path is None:
+                stagnant_iterations += 1
+            else:
+                stagnant_iterations = 0
+                best_path = improved_path
+            if checkpoint is not None and num_ants == m:
+                history.append(average_length/num_ants)
+
+            # Every termination criterion is checked at the end of each
+            # iteration, the first one met stops the run
+            stop_reason = None
+            if target_fitness is not None and best_fitness <= target_fitness:
+                stop_reason = "target_fitness"
+            elif (stagnation_limit is not None
+                    and stagnant_iterations >= stagnation_limit):
+                stop_reason = "stagnation"
+            elif (time_limit is not None
+                    and time.perf_counter() - start_time >= time_limit):
+                stop_reason = "time_limit"
+            elif fitness_evaluations >= evaluations:
+                stop_reason = "evaluations"
+
+            # The checkpoint is written once the interval, in iterations or
+            # seconds (every iteration if neither is given), has passed, and
+            # when the run stops
+            if checkpoint is not None:
+                now = time.perf_counter()
+                if (stop_reason is not None
+                        or (checkpoint_iterations is None
+                            and checkpoint_seconds is None)
+                        or (checkpoint_iterations is not None
+                            and iteration - checkpoint_iteration
+                            >= checkpoint_iterations)
+                        or (checkpoint_seconds is not None
+                            and now - checkpoint_time >= checkpoint_seconds)):
+                    save_checkpoint(checkpoint, Checkpoint(
+                        iteration, fitness_evaluations, stagnant_iterations,
+                        best_fitness, best_path, history, t,
+                        random.getstate(), constructor.get_state()))
+                    checkpoint_iteration = iteration
+                    checkpoint_time = now
+
+            # The caller decides what to keep, so no history is stored here
+            migrants = yield IterationStatistics(
+                iteration, fitness_evaluations, num_ants, best_fitness,
+                average_length/num_ants, improved_path, stop_reason)
+            if stop_reason is not None:
+                return
+
+            if migrants:
+                with phase(instrumentation, "migration"):
+                    for path in migrants:
+                        if path.length < best_fitness:
+                            best_fitness = path.length
+                            best_path = path
+                            migrant_path = path
+                    t = policy.update_pheromone(graph, migrants, t, q)
+    finally:
+        # Also run if the caller stops iterating early
+        constructor.close()
+
+
 def ant_colony_optimisation_algorithm(xml_data: [],
                                       m: int,
                                       q: int,
                                       alpha: float,
                                       beta: int,
                                       starting_node: int,
-                                      evaporation_rate: float
+                                      evaporation_rate: float,
+                                      policy: AntSystemPolicy = None,
+                                      engine: str = "python",
+                                      candidate_lists: bool = False,
+                                      candidate_list_size: int = 15,
+                                      workers: int = None,
+                                      sampler: str = "linear",
+                                      evaluations: int = 10_000,
+                                      time_limit: float = None,
+                                      target_fitness: float = None,
+                                      stagnation_limit: int = None,
+                                      local_search: str = None,
+                                      local_search_neighbours: int = 10,
+                                      checkpoint: str = None,
+                                      checkpoint_iterations: int = None,
+                                      checkpoint_seconds: float = None,
+                                      resume: bool = False,
+                                      verify_lengths: bool = False,
+                                      instrumentation: Instrumentation = None,
+                                      return_reason: bool = False
                                       ) -> (float, [int], float):
     """
-    The main algorithm for the ant colony optimisation method. After the graph
-    has been initialised it loops through 10,000 fitness evaluations,
-    placing the ants on the graph at the specified start node and having them
-    traverse through the graph. When choosing the next node to visit, each
-    valid edge moving from the current edge is assigned a desiribility value.
-    After each ant in the colony (population) has completed its path, the
-    pheromone matrix is updated then evaporated according to a specified
-    evaporation rate. This process then repeats until 10,000 fitness
-    evaluations have been reached. Note the best fitness value and
-    corresponding path taken are tracked throughout the entire process.
-    All the parameters which influence the program are taken as arguments.
+    The main algorithm for the ant colony optimisation method, shared by every
+    variant of the algorithm. After the graph has been initialised it loops
+    through 10,000 fitness evaluations (unless told otherwise), placing the
+    ants on the graph at the specified start node and having them traverse
+    through the graph. When choosing the next node to visit, each valid edge
+    moving from the current edge is assigned a desiribility value. After each
+    ant in the colony (population) has completed its path, the pheromone
+    matrix is updated then evaporated according to the policy of the variant
+    being run. This process then repeats until exactly that many fitness
+    evaluations have been reached, the final iteration only using as many
+    ants as are needed to reach this. Note the best fitness value and
+    corresponding path taken are tracked throughout the entire process. All
+    the parameters which influence the program are taken as arguments.
 
     Args:
-        xml_data ([]): The raw data extracted from the provided XML datasets,
-            used to find the nodes in the graph and the connections between
-            them. BeautifulSoup extracts this as a list.
+        xml_data (str | TSPInstance | []): The dataset used to find the nodes
+            in the graph and the connections between them. Either the path to
+            the dataset, an instance already loaded by load_instance or the
+            raw XML data extracted by BeautifulSoup.
         m (int): The colony size, this is the number of ants that traverse
             the graph in each iteration. Stored as an int as you can only have
             a whole number of ants. Base value of 10.
@@ -240,6 +1044,65 @@ def ant_colony_optimisation_algorithm(xml_data: [],
         evaporation_rate (float): The rate at which pheromone is evaporated
             from the pheromone matrix after each iteration. Stored as a float
             as this value must be betwee 0 and 1.
+        policy (AntSystemPolicy): The pheromone update rules of the variant
+            being run, None uses the standard ant system.
+        engine (str): The engine used to build the ants' paths, either
+            "python" for construct_path, "numpy" for the batched NumPy engine
+            in numpy_aco_algorithm, which builds every ant's path at once, or
+            "parallel" for parallel_colony, which splits the ants of each
+            iteration between worker processes.
+        candidate_lists (bool): Whether ants only consider the unvisited nodes
+            in a candidate list of the current node's nearest neighbours,
+            falling back to every unvisited node once these are all visited.
+        candidate_list_size (int): The number of nearest neighbours stored in
+            each node's candidate list. Base value of 15.
+        workers (int): The number of worker processes used by the parallel
+            engine, None uses every core.
+        sampler (str): How the next node of a path is chosen, either
+            "linear" for a roulette wheel over the considered nodes, or
+            "fenwick" to draw from a Fenwick tree of each node's edges,
+            rejecting visited nodes and falling back to the roulette wheel
+            late in a path, which is faster for instances of several hundred
+            nodes or more (see fenwick_sampler). The NumPy engine only
+            supports "linear".
+        evaluations (int): The number of fitness evaluations (ant paths)
+            performed before the algorithm stops. Base value of 10,000.
+        time_limit (float): The number of seconds after which the algorithm
+            stops, checked at the end of each iteration. None sets no limit.
+        target_fitness (float): The algorithm stops once a path at least this
+            short has been found, for example the known optimum of a
+            dataset. None sets no target.
+        stagnation_limit (int): The algorithm stops once this many iterations
+            in a row have not improved the best fitness. None sets no limit.
+        local_search (str): Which paths are improved with 2-opt and Or-opt
+            local search after they are built, either "all", "iteration_best"
+            or "elite" (the paths the policy selects to deposit pheromone),
+            None turns local search off. Only suited to symmetric instances.
+        local_search_neighbours (int): The number of nearest neighbours of
+            each node local search considers joining it to. Base value of 10.
+        checkpoint (str): The file the state of the run is saved to, so an
+            interrupted run can be resumed (see checkpoint). None turns
+            checkpointing off.
+        checkpoint_iterations (int): The number of iterations between
+            checkpoints. If neither this nor checkpoint_seconds is given, a
+            checkpoint is written after every iteration. A checkpoint is
+            always written when the run stops.
+        checkpoint_seconds (float): The number of seconds between
+            checkpoints, checked at the end of each iteration.
+        resume (bool): Whether the run continues from the checkpoint file,
+            if it exists, giving exactly the same results as if it had never
+            been interrupted. The other arguments must match the original
+            run, and the time limit restarts from when the run is resumed.
+        verify_lengths (bool): Whether the length carried by every tour is
+            checked against path_length, raising an AssertionError if they
+            differ. Only used when testing the engines, as it calculates every
+            length a second time.
+        instrumentation (Instrumentation): Records the time spent in each
+            phase of the algorithm and counts the events in building the
+            paths (see instrumentation), None turns this off so nothing is
+            measured.
+        return_reason (bool): Whether the reason the algorithm stopped is
+            returned as well.
 
     Returns:
         (best_fitness,
@@ -247,166 +1110,54 @@ def ant_colony_optimisation_algorithm(xml_data: [],
         average_solution_tracker) (float, [int], [float]): Returns a tuple
             storing the best fitness found, its accompanying path and the
             average solution length found at each iteration (only used for
-            matplotlib).
+            matplotlib). If return_reason is set, the reason the algorithm
+            stopped (one of STOP_REASONS) is added to the end of the tuple.
     """
-    # The paths taken by each of the ants
-    paths = []
     # The best fitness found thus far
     best_fitness = math.inf
     # The path associated with this best fitness value
     best_path = []
-    # The index representing the current node being looked at
-    current_node = starting_node
     # Used to help track the convergence characterisitcs of the algorithm
     # (enables matplot lib to plot the convergence behaviour)
     average_solution_tracker = []
-
-    # Initialise the graph and pheromone matrix
-    (graph, t) = initialisation(xml_data)
-    accuracy = xml_data.find_all('doublePrecision')
-    accuracy = int(accuracy[0].string)
-
-    # Initialise the heuristic matrix
-    # Each index in the graph stores num_nodes edges, so it can be used to
-    # size the heuristic matrix
-    heuristic_matrix = [0] * len(graph[0])
-    # Initialised so that every index holds a placeholder value of 0
-    for i in range(0, len(graph[0])):
-        heuristic_matrix[i] = [0] * len(graph[0])
-
-    # Loop through each element in the heuristic matrix
-    for j in range(0, len(heuristic_matrix[0])):
-        for k in range(0, len(heuristic_matrix[0])):
-            # If the index is on the leading diagonal it remains 0
-            if j != k:
-                # Otherwise the index = 1/ edge length
-                heuristic_matrix[j][k] = round((1/graph[j][k]), accuracy)
-
-    # Used for tracking in Matplotlib
-    iteration = 0
-    # Stop executing the algorithm after 10,000 fitness evaluations
-    fitness_evaluations = 0
-    while fitness_evaluations < 10_000:
-        # For every fitness evaluation re-initialise the array storing the
-        # paths taken by the ants
-        paths = [0] * m
-        for a in range(0, m):
-            paths[a] = []
-
-        # For consistency sake, the starting node is always set to 0 at the
-        # start of each iteration
-        starting_node = 0
-        # Finds a path through the graph with each ant
-        for ant in range(0, m):
-            # If the number of fitness evaluations has been surpassed break
-            # out the loop
-            if fitness_evaluations > 10_000:
-                break
-
-            # Create a copy of the heuristic matrix so it can be used
-            # without impacting the original
-            H = copy.deepcopy(heuristic_matrix)
-            # Reset the current node being looked at to the starting node
-            current_node = starting_node
-            # Creates an array to store the nodes that must still be visited
-            nodes = []
-            for c in range(0, len(graph[0])):
-                nodes.append(c)
-
-            # Add the starting node to the path taken
-            paths[ant].append(current_node)
-            # Remove the starting node from the list of nodes to visit
-            nodes.remove(current_node)
-
-            # Traverses until there are no more nodes to visit
-            while len(nodes) > 0:
-                # Remove the current node from the heuristic matrix
-                # For all ants this will initially be the starting node
-                for d in range(0, len(H[0])):
-                    H[d][current_node] = 0
-
-                # Calculate the transition (desirability) probabilities
-                # Start by calculating the numerator values for each edge, as
-                # well as the sum of these numerators
-                sum = 0
-                numerators = [0] * len(H[0])
-                for e in range(0, len(H[0])):
-                    if e in nodes:
-                        # The numerator is the desirability of a given edge
-                        numerators[e] = ((t[current_node][e])**alpha) * (
-                                         (H[current_node][e])**beta)
-                        # The sum is the sum of the desirability of all edges
-                        # leaving the current node
-                        sum += numerators[e]
-
-                # If the sum is 0, randomly choose a node from the list of
-                # remaning nodes
-                if sum == 0:
-                    current_node = random.choice(nodes)
-                else:
-                    # Otherwise, find the probability of choosing each node
-                    # This is edge desirability/ total desirability
-                    probability = []
-                    for f in range(0, len(numerators)):
-                        probability.append(numerators[f]/sum)
-
-                    cumulative_probability = 0
-                    random_num = random.random()
-                    # Generate a random number, where the first edge whose
-                    # cumulative probability >= this value represents the
-                    # node to visit next
-                    for g in range(0, len(numerators)):
-                        cumulative_probability += probability[g]
-                        if cumulative_probability >= random_num:
-                            current_node = g
-                            break
-
-                # Add the next node to visit to the path taken
-                paths[ant].append(current_node)
-                # Remove the next node to visit from the list of unvisited
-                # nodes
-                nodes.remove(current_node)
-
-            # The ant must return to the starting node to complete the path
-            paths[ant].append(starting_node)
-
-            # Check if the ants current path is better than the global best
-            # If it is, update the best fitness value and best path taken
-            current_path_length = path_length(graph, paths[ant])
-            if current_path_length < best_fitness:
-                best_fitness = current_path_length
-                best_path = paths[ant]
-
-            # As the fitness of a solution has been evaluated, increment
-            fitness_evaluations += 1
-
-        # Once all the paths have been found for this iteration, update the
-        # pheromone values
-        t = update_pheromone(graph, paths, t, q)
-
-        # Once the pheromone matrix has been updated, evaporate the pheromone
-        # values
-        t = evaporate_pheromone(t, evaporation_rate)
-
-        iteration += 1
-
-        # Calculate the average path length for every iteration bar the last
+    # If no iterations are run, the evaluations ran out before the first
+    stop_reason = "evaluations"
+
+    # A resumed run carries on from the checkpoint's results
+    resumed = None
+    if resume and checkpoint is not None and os.path.exists(checkpoint):
+        resumed = load_checkpoint(checkpoint)
+        best_fitness = resumed.best_fitness
+        best_path = resumed.best_path
+        average_solution_tracker = list(resumed.history)
+
+    for statistics in iterate_colony(xml_data, m, q, alpha, beta,
+                                     starting_node, evaporation_rate, policy,
+                                     engine, candidate_lists,
+                                     candidate_list_size, workers, sampler,
+                                     evaluations, time_limit, target_fitness,
+                                     stagnation_limit, local_search,
+                                     local_search_neighbours, checkpoint,
+                                     checkpoint_iterations,
+                                     checkpoint_seconds, resume,
+                                     verify_lengths, instrumentation,
+                                     resumed):
+        best_fitness = statistics.best_fitness
+        if statistics.stop_reason is not None:
+            stop_reason = statistics.stop_reason
+        if statistics.best_path is not None:
+            best_path = statistics.best_path
+
+        # The average path length is recorded for every full iteration
         # Fewer than normal paths taken skews the result.
-        if fitness_evaluations <= 10000:
-            average_length = 0
-            for path in paths:
-                average_length += path_length(graph, path)
-
-            average_length = average_length/m
-            # print("The average length of the paths in this iteration is:
-            #       ", average_length)
-            # print("The best path length found so far is:
-            #       ", best_fitness, "\n")
+        if statistics.num_ants == m:
             # Used for tracking convergence in Matplotlib
-            average_solution_tracker.append(average_length)
+            average_solution_tracker.append(statistics.mean_length)
+
+    if return_reason:
+        return (best_fitness, best_path, average_solution_tracker,
+                stop_reason)
 
-    # print("The number of iterations this algorithm executed was:
-    #       ", iteration)
     return (best_fitness, best_path, average_solution_tracker)
 
 
@@ -415,13 +1166,9 @@ if __name__ == "__main__":
     FILE_NAME = str(input("What is the full name (incl extension)"
                           + " of the file to be used:"))
 
-    # Deconstructs the XML file to determine the number of nodes and the
-    # connections between each of the nodes
-    with open('../docs/' + FILE_NAME, 'r') as file:
-        file_data = file.read()
-
-    # Uses BeautifulSoup to extract the raw XML data for the whole file
-    xml_data = BeautifulSoup(file_data, 'xml')
+    # Loads the dataset, reading the nodes in the graph and the connections
+    # between each of the nodes in a single pass
+    xml_data = load_instance('../docs/' + FILE_NAME)
 
     # Executes the ACO with the given parameters and times its execution
     start_time = time.time()